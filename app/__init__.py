@@ -16,10 +16,13 @@ def create_app():
     data_dir = app.config["DATA_DIR"]
     os.makedirs(os.path.join(data_dir, "audio"), exist_ok=True)
     os.makedirs(os.path.join(data_dir, "sources"), exist_ok=True)
+    os.makedirs(os.path.join(data_dir, "tts_cache"), exist_ok=True)
 
     # Initialize database
-    from app.database import init_db
+    from app.database import init_db, close_connection
     init_db()
+    close_connection()
+    app.teardown_appcontext(close_connection)
 
     from app.routes import main_bp
     app.register_blueprint(main_bp)
@@ -0,0 +1,106 @@
+"""MP3 frame handling for joining chunk audio without re-encoding."""
+from typing import BinaryIO, Iterator, Optional
+
+# Bitrates in kbps, indexed by the 4-bit bitrate field
+_BITRATES = {
+    (1, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (1, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (1, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (2, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (2, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (2, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+# Sample rates indexed by the 2-bit version field (0 = MPEG 2.5, 1 is reserved)
+_SAMPLE_RATES = {
+    0: (11025, 12000, 8000),
+    2: (22050, 24000, 16000),
+    3: (44100, 48000, 32000),
+}
+# Encoders put a Xing/Info (or VBRI) tag in a silent first frame. It holds the
+# frame count of that one file, so it must not survive into a joined file.
+_VBR_TAGS = (b'Xing', b'Info', b'VBRI')
+
+
+def _id3v2_size(data: bytes) -> int:
+    """Length of a leading ID3v2 tag, or 0 if there is none."""
+    if len(data) < 10 or data[:3] != b'ID3':
+        return 0
+    size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def _parse_header(data: bytes, pos: int) -> Optional[tuple[int, int, int]]:
+    """Parse the frame header at pos.
+
+    Returns:
+        Tuple of (frame_length, samples, sample_rate), or None if pos is not
+        the start of a valid frame
+    """
+    if pos + 4 > len(data) or data[pos] != 0xFF or data[pos + 1] & 0xE0 != 0xE0:
+        return None
+    version = (data[pos + 1] >> 3) & 3
+    layer = 4 - ((data[pos + 1] >> 1) & 3)
+    bitrate_index = data[pos + 2] >> 4
+    rate_index = (data[pos + 2] >> 2) & 3
+    if version == 1 or layer == 4 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+
+    mpeg1 = version == 3
+    bitrate = _BITRATES[(1 if mpeg1 else 2, layer)][bitrate_index] * 1000
+    sample_rate = _SAMPLE_RATES[version][rate_index]
+    padding = (data[pos + 2] >> 1) & 1
+
+    if layer == 1:
+        return (12 * bitrate // sample_rate + padding) * 4, 384, sample_rate
+    samples = 576 if layer == 3 and not mpeg1 else 1152
+    return samples // 8 * bitrate // sample_rate + padding, samples, sample_rate
+
+
+def _audio_frames(data: bytes) -> Iterator[tuple[int, int, float]]:
+    """Yield (start, end, seconds) for each audio frame in an MP3 file.
+
+    Tags and stray bytes between frames are skipped.
+    """
+    pos = _id3v2_size(data)
+    first = True
+    while pos < len(data):
+        header = _parse_header(data, pos)
+        if header is None:
+            pos = data.find(b'\xff', pos + 1)
+            if pos == -1:
+                return
+            continue
+        length, samples, sample_rate = header
+        end = pos + length
+        if end > len(data):
+            return
+        if not (first and any(tag in data[pos + 4:pos + 44] for tag in _VBR_TAGS)):
+            yield pos, end, samples / sample_rate
+        first = False
+        pos = end
+
+
+def append_mp3(out: BinaryIO, data: bytes) -> float:
+    """Append the audio frames of one MP3 file to an open output file.
+
+    Frames are copied byte for byte; tags and the VBR header frame are left
+    out so players compute the length of the joined stream themselves.
+
+    Returns:
+        Duration of the appended audio in seconds
+    """
+    view = memoryview(data)
+    duration = 0.0
+    run_start = run_end = None
+    for start, end, seconds in _audio_frames(data):
+        duration += seconds
+        if start != run_end:
+            # Flush the previous run of back-to-back frames
+            if run_start is not None:
+                out.write(view[run_start:run_end])
+            run_start = start
+        run_end = end
+    if run_start is not None:
+        out.write(view[run_start:run_end])
+    return duration
@@ -1,31 +1,53 @@
 import re
+import string
 from typing import Generator
 from app.config import Config
 
 # Minimum characters for a valid chunk (skip chunks with just punctuation/whitespace)
 MIN_CHUNK_CHARS = 3
 
+# ASCII letters and digits counted as "actual content"
+_ALNUM = frozenset(string.ascii_letters + string.digits)
+# Every other ASCII byte, deleted with bytes.translate to count the rest in C
+_NON_ALNUM_BYTES = bytes(b for b in range(128) if chr(b) not in _ALNUM)
+
+# Precompiled patterns (these run once per chunk/paragraph on the hot path)
+_SENT_SPLIT = re.compile(r'([.!?])\s+')
+_PARA_SPLIT = re.compile(r'\n\s*\n')
+
 
 def is_valid_chunk(text: str) -> bool:
     """Check if chunk has enough actual content to be worth converting."""
-    stripped = text.strip()
-    if not stripped:
-        return False
-    # Must have at least some alphanumeric content
-    alphanumeric = re.sub(r'[^a-zA-Z0-9]', '', stripped)
-    return len(alphanumeric) >= MIN_CHUNK_CHARS
+    # Must have at least some alphanumeric content; stop as soon as we've seen enough
+    count = 0
+    for ch in text:
+        if ch in _ALNUM:
+            count += 1
+            if count >= MIN_CHUNK_CHARS:
+                return True
+    return False
+
+
+def count_alnum(text: str) -> int:
+    """Count the alphanumeric characters that make a chunk worth converting."""
+    # Non-ASCII characters never count, so drop them while encoding
+    return len(text.encode('ascii', 'ignore').translate(None, _NON_ALNUM_BYTES))
 
 
 def split_into_sentences(text: str) -> list[str]:
     """Split text into sentences, preserving sentence boundaries."""
-    # Split on sentence-ending punctuation followed by space or end
-    sentences = re.split(r'(?<=[.!?])\s+', text)
+    # Split on sentence-ending punctuation followed by whitespace. The
+    # punctuation is captured, so parts alternate [text, punct, text, ...]
+    # and each sentence gets its punctuation glued back on.
+    parts = _SENT_SPLIT.split(text)
+    sentences = [parts[i] + parts[i + 1] for i in range(0, len(parts) - 1, 2)]
+    sentences.append(parts[-1])
     return [s.strip() for s in sentences if s.strip()]
 
 
 def split_into_paragraphs(text: str) -> list[str]:
     """Split text into paragraphs."""
-    paragraphs = re.split(r'\n\s*\n', text)
+    paragraphs = _PARA_SPLIT.split(text)
     return [p.strip() for p in paragraphs if p.strip()]
 
 
@@ -56,38 +78,52 @@ def chunk_text(text: str, max_chunk_size: int = None) -> Generator[str, None, No
             yield paragraph
             continue
 
-        # Paragraph too long, split by sentences
+        # Paragraph too long, split by sentences. Sentences are collected in
+        # a list and joined on emit; length and alphanumeric counts are
+        # tracked alongside so nothing is rescanned while building.
         sentences = split_into_sentences(paragraph)
-        current_chunk = ""
+        parts = []
+        current_len = 0
+        current_alnum = 0
 
         for sentence in sentences:
+            sentence_alnum = count_alnum(sentence)
+            if not sentence_alnum:
+                # Nothing speakable (stray punctuation/symbols)
+                continue
+
             if len(sentence) > max_chunk_size:
                 # Sentence too long, yield current chunk and split sentence
-                if current_chunk and is_valid_chunk(current_chunk):
-                    yield current_chunk
-                    current_chunk = ""
+                if parts and current_alnum >= MIN_CHUNK_CHARS:
+                    yield " ".join(parts)
+                    parts = []
+                    current_len = 0
+                    current_alnum = 0
 
                 # Split long sentence by max_chunk_size
                 for i in range(0, len(sentence), max_chunk_size):
                     part = sentence[i:i + max_chunk_size]
                     if is_valid_chunk(part):
                         yield part
-            elif len(current_chunk) + len(sentence) + 1 <= max_chunk_size:
+            elif current_len + len(sentence) + 1 <= max_chunk_size:
                 # Add sentence to current chunk
-                if current_chunk:
-                    current_chunk += " " + sentence
-                else:
-                    current_chunk = sentence
+                if parts:
+                    current_len += 1
+                parts.append(sentence)
+                current_len += len(sentence)
+                current_alnum += sentence_alnum
             else:
                 # Current chunk full, yield and start new
-                if current_chunk and is_valid_chunk(current_chunk):
-                    yield current_chunk
-                current_chunk = sentence
+                if parts and current_alnum >= MIN_CHUNK_CHARS:
+                    yield " ".join(parts)
+                parts = [sentence]
+                current_len = len(sentence)
+                current_alnum = sentence_alnum
 
-        if current_chunk and is_valid_chunk(current_chunk):
-            yield current_chunk
+        if parts and current_alnum >= MIN_CHUNK_CHARS:
+            yield " ".join(parts)
 
 
 def count_chunks(text: str, chunk_size: int = None) -> int:
     """Count how many chunks the text will be split into."""
-    return len(list(chunk_text(text, chunk_size)))
+    return sum(1 for _ in chunk_text(text, chunk_size))
@@ -10,6 +10,9 @@ class Config:
     INITIAL_CHUNK_SIZE = int(os.getenv("INITIAL_CHUNK_SIZE", "4000"))
     MIN_CHUNK_SIZE = int(os.getenv("MIN_CHUNK_SIZE", "500"))
     LARGE_INPUT_WARNING = int(os.getenv("LARGE_INPUT_WARNING", "100000"))
+    TTS_MAX_WORKERS = int(os.getenv("TTS_MAX_WORKERS", "4"))
+    TTS_CHUNK_PARALLELISM = int(os.getenv("TTS_CHUNK_PARALLELISM", "4"))
+    TTS_CACHE_MAX_MB = int(os.getenv("TTS_CACHE_MAX_MB", "512"))  # 0 disables the cache
     DATA_DIR = os.getenv("DATA_DIR", "/data")
     HOST = os.getenv("HOST", "0.0.0.0")
     PORT = int(os.getenv("PORT", "4040"))
@@ -1,16 +1,50 @@
 import sqlite3
 import os
+import threading
+from functools import lru_cache
 from contextlib import contextmanager
 from app.config import Config
 
+# One cached connection per thread (request threads and conversion workers)
+_local = threading.local()
 
+
+# Per-connection tuning; journal_mode=WAL is persistent and set once in init_db
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-20000",
+)
+
+
+@lru_cache(maxsize=1)
 def get_db_path():
     return os.path.join(Config.DATA_DIR, "tinytts.db")
 
 
 def init_db():
     with get_connection() as conn:
+        # WAL lets readers overlap with writes (including FTS trigger work)
+        conn.execute("PRAGMA journal_mode=WAL")
+
+        # Older databases also indexed content_preview, which is just a prefix
+        # of full_text; drop that index so it is recreated without it.
+        fts = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type='table' AND name='conversions_fts'"
+        ).fetchone()
+        rebuild_fts = fts is not None and "content_preview" in fts["sql"]
+        if rebuild_fts:
+            conn.executescript("""
+                DROP TRIGGER IF EXISTS conversions_ai;
+                DROP TRIGGER IF EXISTS conversions_ad;
+                DROP TRIGGER IF EXISTS conversions_au;
+                DROP TABLE conversions_fts;
+            """)
+
         conn.executescript("""
+            BEGIN;
+
             CREATE TABLE IF NOT EXISTS conversions (
                 id TEXT PRIMARY KEY,
                 created_at DATETIME NOT NULL,
@@ -24,49 +58,88 @@ def init_db():
                 audio_path TEXT NOT NULL,
                 audio_duration REAL,
                 audio_size INTEGER NOT NULL,
-                full_text TEXT NOT NULL
+                full_text TEXT NOT NULL,
+                created_at_ms INTEGER,
+                source_size INTEGER NOT NULL DEFAULT 0
             );
 
             CREATE INDEX IF NOT EXISTS idx_created_at ON conversions(created_at);
+
+            CREATE VIRTUAL TABLE IF NOT EXISTS conversions_fts USING fts5(
+                full_text, original_filename, content='conversions', content_rowid='rowid'
+            );
+
+            CREATE TRIGGER IF NOT EXISTS conversions_ai AFTER INSERT ON conversions BEGIN
+                INSERT INTO conversions_fts(rowid, full_text, original_filename)
+                VALUES (NEW.rowid, NEW.full_text, NEW.original_filename);
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS conversions_ad AFTER DELETE ON conversions BEGIN
+                INSERT INTO conversions_fts(conversions_fts, rowid, full_text, original_filename)
+                VALUES('delete', OLD.rowid, OLD.full_text, OLD.original_filename);
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS conversions_au AFTER UPDATE ON conversions BEGIN
+                INSERT INTO conversions_fts(conversions_fts, rowid, full_text, original_filename)
+                VALUES('delete', OLD.rowid, OLD.full_text, OLD.original_filename);
+                INSERT INTO conversions_fts(rowid, full_text, original_filename)
+                VALUES (NEW.rowid, NEW.full_text, NEW.original_filename);
+            END;
+
+            COMMIT;
         """)
-        # Create FTS table if not exists
-        cursor = conn.execute(
-            "SELECT name FROM sqlite_master WHERE type='table' AND name='conversions_fts'"
-        )
-        if not cursor.fetchone():
+        if rebuild_fts:
+            conn.execute("INSERT INTO conversions_fts(conversions_fts) VALUES ('rebuild')")
+
+        # Databases created before created_at_ms existed: add and backfill it
+        columns = [row["name"] for row in conn.execute("PRAGMA table_info(conversions)")]
+        if "created_at_ms" not in columns:
             conn.executescript("""
-                CREATE VIRTUAL TABLE conversions_fts USING fts5(
-                    full_text, content_preview, original_filename, content='conversions', content_rowid='rowid'
-                );
-
-                CREATE TRIGGER conversions_ai AFTER INSERT ON conversions BEGIN
-                    INSERT INTO conversions_fts(rowid, full_text, content_preview, original_filename)
-                    VALUES (NEW.rowid, NEW.full_text, NEW.content_preview, NEW.original_filename);
-                END;
-
-                CREATE TRIGGER conversions_ad AFTER DELETE ON conversions BEGIN
-                    INSERT INTO conversions_fts(conversions_fts, rowid, full_text, content_preview, original_filename)
-                    VALUES('delete', OLD.rowid, OLD.full_text, OLD.content_preview, OLD.original_filename);
-                END;
-
-                CREATE TRIGGER conversions_au AFTER UPDATE ON conversions BEGIN
-                    INSERT INTO conversions_fts(conversions_fts, rowid, full_text, content_preview, original_filename)
-                    VALUES('delete', OLD.rowid, OLD.full_text, OLD.content_preview, OLD.original_filename);
-                    INSERT INTO conversions_fts(rowid, full_text, content_preview, original_filename)
-                    VALUES (NEW.rowid, NEW.full_text, NEW.content_preview, NEW.original_filename);
-                END;
+                ALTER TABLE conversions ADD COLUMN created_at_ms INTEGER;
+                UPDATE conversions
+                SET created_at_ms = CAST(ROUND((julianday(created_at) - 2440587.5) * 86400000) AS INTEGER);
             """)
 
+        # Source file sizes feed the storage total; older rows read them from disk once
+        if "source_size" not in columns:
+            conn.execute("ALTER TABLE conversions ADD COLUMN source_size INTEGER NOT NULL DEFAULT 0")
+            sizes = []
+            for row in conn.execute("SELECT id, source_path FROM conversions").fetchall():
+                try:
+                    sizes.append((os.stat(row["source_path"]).st_size, row["id"]))
+                except FileNotFoundError:
+                    pass
+            conn.executemany("UPDATE conversions SET source_size = ? WHERE id = ?", sizes)
 
-@contextmanager
-def get_connection():
+
+def _connect():
     conn = sqlite3.connect(get_db_path())
     conn.row_factory = sqlite3.Row
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+@contextmanager
+def get_connection():
+    """Yield this thread's connection, committing on success.
+
+    The connection stays open for reuse; call close_connection() to release it.
+    """
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = _local.conn = _connect()
     try:
         yield conn
         conn.commit()
     except Exception:
         conn.rollback()
         raise
-    finally:
+
+
+def close_connection(exc=None):
+    """Close this thread's cached connection, if any."""
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        _local.conn = None
         conn.close()
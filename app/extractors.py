@@ -1,7 +1,73 @@
+import multiprocessing
 import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from html.parser import HTMLParser
+from itertools import repeat
 import markdown2
+import pymupdf
 import pymupdf4llm
 
+# PDFs with at least this many pages are extracted in parallel page batches
+PDF_PARALLEL_MIN_PAGES = 32
+
+# Worker processes shared by all PDF extractions; started on first use
+_pdf_executor = None
+_pdf_executor_lock = threading.Lock()
+
+# Line-break characters normalized to \n in a single translate() pass
+_LINE_BREAKS = str.maketrans({
+    '\r': '\n',
+    '\x0c': '\n',        # form feed
+    '\x0b': '\n',        # vertical tab
+    '\u2028': '\n',      # Unicode line separator
+    '\u2029': '\n\n',    # Unicode paragraph separator
+})
+
+# Precompiled patterns used by normalize_text
+_NEEDS_NORMALIZING = re.compile(r'[\n\r\t\x0b\x0c\u2028\u2029]|  ')
+_MULTISPACE = re.compile(r'[ \t]+')
+_PARA_PAD = re.compile(r' *\n\n *')
+_WHITESPACE_RUN = re.compile(
+    r'(?P<para>[ \t]*\n[ \t]*\n[ \t\n]*)'   # blank line(s) -> paragraph break
+    r'|[ \t]*\n[ \t]*'                       # single newline -> space
+    r'|[ \t]{2,}|\t'                          # space/tab runs -> space
+)
+
+# PyPDF2 word-per-line format: paragraph breaks, numbered sections, bullets
+_PYPDF_NEWLINES = re.compile(
+    r'(?P<para>\n(?: \n){2,})'   # 3+ newlines with spaces between -> paragraph break
+    r'|\n \n|\n'                # word separator / stray newline -> space
+)
+_NUMBERED_SECTION = re.compile(r' (\d+\.(?:\d+)?) ([A-Z][a-z]+)')
+_BULLET = re.compile(r' ([●○•◦▪▸►]) ')
+
+
+def _collapse_whitespace(match: re.Match) -> str:
+    # Shared callback for _WHITESPACE_RUN and _PYPDF_NEWLINES
+    return '\n\n' if match.group('para') else ' '
+
+
+class _TextCollector(HTMLParser):
+    """Collect the text content of an HTML document, dropping all tags."""
+
+    def __init__(self):
+        super().__init__()
+        self.parts = []
+
+    def handle_data(self, data):
+        self.parts.append(data)
+
+
+def html_to_text(html: str) -> str:
+    """Strip tags from HTML in a single streaming pass."""
+    collector = _TextCollector()
+    collector.feed(html)
+    collector.close()
+    return ''.join(collector.parts)
+
 
 def extract_text_from_file(filepath: str) -> str:
     """Extract text content from a file based on its extension.
@@ -38,11 +104,9 @@ def extract_from_markdown(filepath: str) -> str:
     with open(filepath, "r", encoding="utf-8") as f:
         content = f.read()
 
-    # Convert markdown to HTML, then strip tags
+    # Convert markdown to HTML, then collect the text nodes
     html = markdown2.markdown(content)
-    # Simple tag stripping
-    import re
-    text = re.sub(r'<[^>]+>', '', html)
+    text = html_to_text(html)
     return normalize_text(text)
 
 
@@ -58,10 +122,60 @@ def extract_from_pdf(filepath: str) -> str:
     The Markdown output is then processed by the TTS preprocessor
     which converts headers and bullets to proper pause markers.
     """
-    markdown_text = pymupdf4llm.to_markdown(filepath)
+    with pymupdf.open(filepath) as doc:
+        page_count = doc.page_count
+
+    workers = min(os.cpu_count() or 1, page_count // (PDF_PARALLEL_MIN_PAGES // 2))
+    if page_count < PDF_PARALLEL_MIN_PAGES or workers < 2:
+        markdown_text = pymupdf4llm.to_markdown(filepath)
+        return markdown_text.strip()
+
+    # Large PDF: extract contiguous page ranges in worker processes and
+    # stitch the Markdown back together in page order.
+    batch_size = -(-page_count // workers)
+    batches = [list(range(start, min(start + batch_size, page_count)))
+               for start in range(0, page_count, batch_size)]
+    executor = _get_pdf_executor()
+    try:
+        parts = executor.map(_extract_pdf_pages, repeat(filepath), batches)
+        markdown_text = "".join(parts)
+    except BrokenProcessPool:
+        # A worker died (crash or OOM kill); later uploads get a fresh pool
+        # and this one is extracted in a single call
+        _discard_pdf_executor(executor)
+        markdown_text = pymupdf4llm.to_markdown(filepath)
     return markdown_text.strip()
 
 
+def _get_pdf_executor() -> ProcessPoolExecutor:
+    """Return the shared process pool for PDF extraction."""
+    global _pdf_executor
+    with _pdf_executor_lock:
+        if _pdf_executor is None:
+            # The app is multi-threaded, which fork() doesn't handle safely,
+            # so workers are started from a clean forkserver process
+            _pdf_executor = ProcessPoolExecutor(
+                max_workers=os.cpu_count() or 1,
+                mp_context=multiprocessing.get_context("forkserver")
+            )
+        return _pdf_executor
+
+
+def _discard_pdf_executor(executor: ProcessPoolExecutor):
+    """Drop a broken pool so the next extraction starts a new one."""
+    global _pdf_executor
+    with _pdf_executor_lock:
+        # Another thread may already have replaced it
+        if _pdf_executor is executor:
+            _pdf_executor = None
+    executor.shutdown(wait=False)
+
+
+def _extract_pdf_pages(filepath: str, pages: list[int]) -> str:
+    """Extract a range of PDF pages as Markdown (runs in a worker process)."""
+    return pymupdf4llm.to_markdown(filepath, pages=pages)
+
+
 def normalize_text(text: str) -> str:
     """Normalize whitespace and clean up text.
 
@@ -72,37 +186,22 @@ def normalize_text(text: str) -> str:
     Handles PyPDF2's word-per-line format where words are separated by
     '\\n \\n' (newline-space-newline) and paragraphs by '\\n \\n \\n' or more.
     """
-    import re
+    # Already clean (single-line, single-spaced): nothing to do beyond strip
+    if not _NEEDS_NORMALIZING.search(text):
+        return text.strip()
 
     # Step 0: Normalize ALL line-break characters to \n (PDF artifacts)
-    text = text.replace('\r\n', '\n')
-    text = text.replace('\r', '\n')
-    text = text.replace('\x0c', '\n')  # form feed
-    text = text.replace('\x0b', '\n')  # vertical tab
-    text = text.replace('\u2028', '\n')  # Unicode line separator
-    text = text.replace('\u2029', '\n\n')  # Unicode paragraph separator
+    # \r\n must collapse first so it doesn't become two newlines below
+    text = text.replace('\r\n', '\n').translate(_LINE_BREAKS)
 
     # Step 1: Detect PyPDF2 word-per-line format
     # Pattern: words separated by '\n \n' (newline-space-newline)
-    word_per_line_pattern = '\n \n'  # NOT raw string - need actual newlines
-    if word_per_line_pattern in text:
+    if '\n \n' in text:
         # Handle PyPDF2 word-per-line format
         # Paragraph breaks: '\n \n \n' or more (2+ spaces between newlines)
         # Word separators: '\n \n' (single space between newlines)
-        PARA_MARKER = '\x00PARA\x00'
-
-        # First, mark paragraph breaks (3+ newlines with spaces between)
-        # Pattern: \n followed by ( \n) repeated 2+ times = paragraph break
-        text = re.sub(r'\n( \n){2,}', PARA_MARKER, text)
-
-        # Now convert remaining \n \n (word separators) to single space
-        text = text.replace('\n \n', ' ')
-
-        # Convert any remaining single newlines to spaces
-        text = text.replace('\n', ' ')
-
-        # Restore paragraph breaks
-        text = text.replace(PARA_MARKER, '\n\n')
+        # Any other newline is joined with a space. All in a single pass.
+        text = _PYPDF_NEWLINES.sub(_collapse_whitespace, text)
 
         # Step 2: Re-introduce paragraph breaks based on content structure
         # PyPDF2 loses structure - we need to restore it based on patterns
@@ -110,29 +209,22 @@ def normalize_text(text: str) -> str:
         # Add breaks before numbered sections (1. Purpose, 2. Product, etc.)
         # Match: space + digit(s) + period + space + Capital letter word
         # This catches "1. Purpose", "2. Product", "10. Section", "6.1 Subsection"
-        text = re.sub(r' (\d+\.(?:\d+)?) ([A-Z][a-z]+)', r'\n\n\1 \2', text)
+        text = _NUMBERED_SECTION.sub(r'\n\n\1 \2', text)
 
         # Add breaks before bullet points (●, ○, -, *, •)
         # Each bullet should start a new line for TTS pauses
-        text = re.sub(r' ([●○•◦▪▸►]) ', r'\n\n\1 ', text)
-
-    else:
-        # Standard format: use traditional paragraph detection
-        # Convert 2+ newlines (possibly with whitespace) to paragraph breaks
-        text = re.sub(r'\n[ \t]*\n', '\n\n', text)
-        PARA_MARKER = '\x00PARA\x00'
-        text = text.replace('\n\n', PARA_MARKER)
-
-        # Convert remaining single newlines to spaces
-        text = text.replace('\n', ' ')
+        text = _BULLET.sub(r'\n\n\1 ', text)
 
-        # Restore paragraph breaks
-        text = text.replace(PARA_MARKER, '\n\n')
+        # Clean up multiple spaces
+        text = _MULTISPACE.sub(' ', text)
 
-    # Clean up multiple spaces
-    text = re.sub(r'[ \t]+', ' ', text)
+        # Clean up spaces around paragraph breaks
+        text = _PARA_PAD.sub('\n\n', text)
 
-    # Clean up spaces around paragraph breaks
-    text = re.sub(r' *\n\n *', '\n\n', text)
+    else:
+        # Standard format: use traditional paragraph detection.
+        # One pass: blank lines (possibly with whitespace) become paragraph
+        # breaks, single newlines and runs of spaces/tabs become one space.
+        text = _WHITESPACE_RUN.sub(_collapse_whitespace, text)
 
     return text.strip()
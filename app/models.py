@@ -1,14 +1,36 @@
+import threading
+import time
 import uuid
 from datetime import datetime, timezone
 from dataclasses import dataclass
 from typing import Optional
 from app.database import get_connection
 
+# Columns needed for listings; full_text can be megabytes and is only
+# loaded for single-record lookups. Listed in Conversion field order so
+# rows unpack positionally in _from_row.
+SUMMARY_COLUMNS = ("id", "created_at_ms", "input_type", "original_filename", "source_path",
+                   "content_preview", "content_length", "voice", "speed", "audio_path",
+                   "audio_duration", "audio_size", "source_size")
+_SUMMARY_SELECT = ", ".join(SUMMARY_COLUMNS)
+_SUMMARY_SELECT_C = ", ".join(f"c.{col}" for col in SUMMARY_COLUMNS)
+_FULL_SELECT = _SUMMARY_SELECT + ", full_text"
+
+# Cached SUM(audio_size + source_size); reset after every write
+_storage_bytes = None
+_storage_lock = threading.Lock()
+
+
+def _reset_storage_bytes():
+    global _storage_bytes
+    with _storage_lock:
+        _storage_bytes = None
+
 
 @dataclass
 class Conversion:
     id: str
-    created_at: datetime
+    created_at_ms: int  # Unix epoch milliseconds (UTC)
     input_type: str
     original_filename: Optional[str]
     source_path: str
@@ -19,15 +41,17 @@ class Conversion:
     audio_path: str
     audio_duration: Optional[float]
     audio_size: int
-    full_text: str
+    source_size: int
+    full_text: Optional[str] = None
 
     @classmethod
     def create(cls, input_type: str, original_filename: Optional[str], source_path: str,
                full_text: str, voice: str, speed: float, audio_path: str,
-               audio_duration: Optional[float], audio_size: int) -> "Conversion":
+               audio_duration: Optional[float], audio_size: int,
+               source_size: int) -> "Conversion":
         conversion = cls(
             id=str(uuid.uuid4()),
-            created_at=datetime.now(timezone.utc),
+            created_at_ms=int(time.time() * 1000),
             input_type=input_type,
             original_filename=original_filename,
             source_path=source_path,
@@ -38,26 +62,49 @@ class Conversion:
             audio_path=audio_path,
             audio_duration=audio_duration,
             audio_size=audio_size,
+            source_size=source_size,
             full_text=full_text
         )
         conversion.save()
         return conversion
 
+    @property
+    def created_at(self) -> datetime:
+        return datetime.fromtimestamp(self.created_at_ms / 1000, tz=timezone.utc)
+
     def save(self):
         with get_connection() as conn:
             conn.execute("""
-                INSERT OR REPLACE INTO conversions
+                INSERT INTO conversions
                 (id, created_at, input_type, original_filename, source_path, content_preview,
-                 content_length, voice, speed, audio_path, audio_duration, audio_size, full_text)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                 content_length, voice, speed, audio_path, audio_duration, audio_size, full_text,
+                 created_at_ms, source_size)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    created_at = excluded.created_at,
+                    created_at_ms = excluded.created_at_ms,
+                    input_type = excluded.input_type,
+                    original_filename = excluded.original_filename,
+                    source_path = excluded.source_path,
+                    content_preview = excluded.content_preview,
+                    content_length = excluded.content_length,
+                    voice = excluded.voice,
+                    speed = excluded.speed,
+                    audio_path = excluded.audio_path,
+                    audio_duration = excluded.audio_duration,
+                    audio_size = excluded.audio_size,
+                    source_size = excluded.source_size,
+                    full_text = excluded.full_text
             """, (self.id, self.created_at.isoformat(), self.input_type, self.original_filename,
                   self.source_path, self.content_preview, self.content_length, self.voice,
-                  self.speed, self.audio_path, self.audio_duration, self.audio_size, self.full_text))
+                  self.speed, self.audio_path, self.audio_duration, self.audio_size, self.full_text,
+                  self.created_at_ms, self.source_size))
+        _reset_storage_bytes()
 
     @classmethod
     def get_by_id(cls, id: str) -> Optional["Conversion"]:
         with get_connection() as conn:
-            row = conn.execute("SELECT * FROM conversions WHERE id = ?", (id,)).fetchone()
+            row = conn.execute(f"SELECT {_FULL_SELECT} FROM conversions WHERE id = ?", (id,)).fetchone()
             if row:
                 return cls._from_row(row)
         return None
@@ -66,7 +113,7 @@ class Conversion:
     def get_all(cls, limit: int = 50, offset: int = 0) -> list["Conversion"]:
         with get_connection() as conn:
             rows = conn.execute(
-                "SELECT * FROM conversions ORDER BY created_at DESC LIMIT ? OFFSET ?",
+                f"SELECT {_SUMMARY_SELECT} FROM conversions ORDER BY created_at DESC LIMIT ? OFFSET ?",
                 (limit, offset)
             ).fetchall()
             return [cls._from_row(row) for row in rows]
@@ -75,8 +122,8 @@ class Conversion:
     def search(cls, query: str, from_date: Optional[str] = None,
                to_date: Optional[str] = None, limit: int = 50, offset: int = 0) -> list["Conversion"]:
         with get_connection() as conn:
-            sql = """
-                SELECT c.* FROM conversions c
+            sql = f"""
+                SELECT {_SUMMARY_SELECT_C} FROM conversions c
                 JOIN conversions_fts fts ON c.rowid = fts.rowid
                 WHERE conversions_fts MATCH ?
             """
@@ -96,36 +143,46 @@ class Conversion:
             return [cls._from_row(row) for row in rows]
 
     @classmethod
-    def get_oldest(cls) -> Optional["Conversion"]:
+    def get_oldest_n(cls, limit: int) -> list["Conversion"]:
         with get_connection() as conn:
-            row = conn.execute(
-                "SELECT * FROM conversions ORDER BY created_at ASC LIMIT 1"
-            ).fetchone()
-            if row:
-                return cls._from_row(row)
-        return None
+            rows = conn.execute(
+                f"SELECT {_SUMMARY_SELECT} FROM conversions ORDER BY created_at ASC LIMIT ?",
+                (limit,)
+            ).fetchall()
+            return [cls._from_row(row) for row in rows]
+
+    @classmethod
+    def total_storage_bytes(cls) -> int:
+        """Bytes of audio and source files across all conversions."""
+        global _storage_bytes
+        # Held across the query so a reset from a concurrent write can't be
+        # overwritten with a stale sum
+        with _storage_lock:
+            if _storage_bytes is None:
+                with get_connection() as conn:
+                    _storage_bytes = conn.execute(
+                        "SELECT COALESCE(SUM(audio_size + source_size), 0) FROM conversions"
+                    ).fetchone()[0]
+            return _storage_bytes
 
     def delete(self):
         with get_connection() as conn:
             conn.execute("DELETE FROM conversions WHERE id = ?", (self.id,))
+        _reset_storage_bytes()
+
+    @classmethod
+    def delete_ids(cls, ids: list[str]):
+        if not ids:
+            return
+        placeholders = ", ".join("?" * len(ids))
+        with get_connection() as conn:
+            conn.execute(f"DELETE FROM conversions WHERE id IN ({placeholders})", ids)
+        _reset_storage_bytes()
 
     @classmethod
     def _from_row(cls, row) -> "Conversion":
-        return cls(
-            id=row["id"],
-            created_at=datetime.fromisoformat(row["created_at"]),
-            input_type=row["input_type"],
-            original_filename=row["original_filename"],
-            source_path=row["source_path"],
-            content_preview=row["content_preview"],
-            content_length=row["content_length"],
-            voice=row["voice"],
-            speed=row["speed"],
-            audio_path=row["audio_path"],
-            audio_duration=row["audio_duration"],
-            audio_size=row["audio_size"],
-            full_text=row["full_text"]
-        )
+        # Rows come from _SUMMARY_SELECT / _FULL_SELECT, which follow field order
+        return cls(*row)
 
     def to_dict(self, include_full_text: bool = False) -> dict:
         data = {
@@ -1,10 +1,110 @@
 """Text preprocessing for TTS conversion."""
 import re
+from functools import lru_cache
 import inflect
 
 # Initialize inflect engine
 p = inflect.engine()
 
+# Fenced code blocks, images and links get their own passes first: in a
+# shared alternation an emphasis marker before one of them could pair with
+# one inside it (e.g. an underscore in a URL).
+_RE_CODE_BLOCK = re.compile(r'```[\s\S]*?```')
+_RE_IMG = re.compile(r'!\[.*?\]\(.*?\)')
+_RE_LINK = re.compile(r'\[([^\]]+)\]\([^)]+\)')
+# Markdown: one alternation, tried left to right at each position in the
+# same precedence the individual passes used to run (bold before italic).
+_MD_RULES = (
+    ('hr', r'(?P<hr>^[-*_]{3,}\s*$)'),
+    ('header', r'^#{1,6}\s+(?P<header>.+?)$'),
+    ('bold', r'(?s:\*\*(?P<bold>.+?)\*\*)'),
+    ('ital_ast', r'(?s:\*(?P<ital_ast>.+?)\*)'),
+    ('ital_und', r'(?s:_(?P<ital_und>.+?)_)'),
+    ('strike', r'(?s:~~(?P<strike>.+?)~~)'),
+    ('inline_code', r'`(?P<inline_code>[^`]+)`'),
+    ('blockquote', r'(?P<blockquote>^>\s+)'),
+    ('html', r'(?P<html><[^>]+>)'),
+)
+_MD_LINE_RULES = frozenset(('hr', 'header', 'blockquote'))
+_RE_MARKDOWN = re.compile('|'.join(rule for _, rule in _MD_RULES), re.MULTILINE)
+# Text kept from inside a match doesn't start a line, so only inline rules apply
+_RE_MARKDOWN_INLINE = re.compile(
+    '|'.join(rule for name, rule in _MD_RULES if name not in _MD_LINE_RULES)
+)
+_MD_DROP = frozenset(('hr', 'blockquote', 'html'))
+# Every rule needs one of these (or '---' for a dashed rule) to match
+_MD_MARKERS = '#*_`~<>'
+_RE_SUBHEADER = re.compile(r'^([A-Z][^:\n]*:)\s*$', re.MULTILINE)
+
+# Lists and tables
+# ASCII bullets: -, *, +
+# Unicode bullets: •◦▪▸►●○‣⁃
+# A whole list line plus its newline; [^\S\n] is whitespace within the line
+_RE_LIST_ITEM = re.compile(
+    r'^[^\S\n]*(?:[-*+•◦▪▸►●○‣⁃][^\S\n]*(?P<bullet>.*)|\d+[.)][^\S\n]+(?P<numbered>.+))$(?P<nl>\n?)',
+    re.MULTILINE,
+)
+_RE_TABLE_SEP = re.compile(r'^\|[\s\-:|]+\|$')
+# A run of lines that start and end with | (ignoring surrounding whitespace)
+_RE_TABLE_BLOCK = re.compile(
+    r'^(?:[^\S\n]*\|(?:[^\n]*\|)?[^\S\n]*(?:\n|\Z))+',
+    re.MULTILINE,
+)
+_LIST_BULLETS = '-*+•◦▪▸►●○‣⁃'
+# Looser than _RE_LIST_ITEM; only used to rule out numbered items quickly
+_RE_NUMBERED_HINT = re.compile(r'\d[.)]\s')
+
+# Normalization
+_RE_CURRENCY = re.compile(r'\$(\d+)(?:\.(\d{2}))?')
+_RE_PCT = re.compile(r'(\d+)%')
+_RE_ORDINAL = re.compile(r'(\d+)(st|nd|rd|th)\b')
+_RE_DATE = re.compile(r'(\d{1,2})/(\d{1,2})/(\d{4})')
+
+# Unspeakable characters, deleted with a single str.translate
+# Geometric shapes, symbols, and other non-speakable Unicode
+_UNSPEAKABLE_SYMBOLS = '○●◯◉■□▪▫▲△▼▽◆◇★☆♦♣♠♥✓✗✔✘→←↑↓⇒⇐⇔│├└┌┐┘┬┴─═║╔╗╚╝╠╣╬•·©®™°±×÷≠≤≥∞∑∏√∫∂∆∇∈∉⊂⊃∪∩'
+# Common emoji; \ufe0f is the variation selector that follows ⚠ in ⚠️
+_UNSPEAKABLE_EMOJI = '🔹🔸🔷🔶📌📍🔗💡⚠\ufe0f✨🎯📊📈📉'
+_UNSPEAKABLE_TABLE = str.maketrans('', '', _UNSPEAKABLE_SYMBOLS + _UNSPEAKABLE_EMOJI)
+
+# Whitespace
+# Line-break characters (including PDF artifacts) normalized to \n:
+# \r = old Mac, \x0c = form feed, \x0b = vertical tab,
+# \u2028 = Unicode line separator, \u2029 = Unicode paragraph separator
+_LINEBREAK_TABLE = str.maketrans({
+    '\r': '\n',
+    '\x0c': '\n',
+    '\x0b': '\n',
+    '\u2028': '\n',
+    '\u2029': '\n\n',
+})
+_RE_PARA = re.compile(r'\n\s*\n')
+
+
+def _replace_markdown(match: re.Match) -> str:
+    kind = match.lastgroup
+    if kind in _MD_DROP:
+        return ''
+    # Kept text may itself contain markup (e.g. italic inside bold)
+    inner = _RE_MARKDOWN_INLINE.sub(_replace_markdown, match.group(kind))
+    if kind == 'header':
+        # Ensure double newline follows for TTS pause
+        return inner + '\n\n'
+    return inner
+
+
+def _replace_list_item(match: re.Match) -> str:
+    item = match.group('bullet')
+    if item is None:
+        item = match.group('numbered')
+    item = item.strip()
+    if not item:
+        # Empty items are dropped along with their line
+        return ''
+    if item[-1] not in '.!?':
+        item += '.'
+    return item + match.group('nl')
+
 
 def strip_markdown(text: str) -> str:
     """Remove markdown formatting, keeping plain text content.
@@ -15,45 +115,24 @@ def strip_markdown(text: str) -> str:
     - Lines ending with : -> text + pause (~750ms for sub-headers)
     """
     # Code blocks first (before other patterns can match inside them)
-    text = re.sub(r'```[\s\S]*?```', '', text)
-
-    # Horizontal rules
-    text = re.sub(r'^[-*_]{3,}\s*$', '', text, flags=re.MULTILINE)
-
-    # Images (before links, as images use similar syntax)
-    text = re.sub(r'!\[.*?\]\(.*?\)', '', text)
-
-    # Links - keep text
-    text = re.sub(r'\[([^\]]+)\]\([^)]+\)', r'\1', text)
-
-    # Headers - strip # markers but preserve the header text with pause after
-    # Match header line and ensure double newline follows for TTS pause
-    text = re.sub(r'^#{1,6}\s+(.+?)$', r'\1\n\n', text, flags=re.MULTILINE)
-
-    # Bold
-    text = re.sub(r'\*\*(.+?)\*\*', r'\1', text, flags=re.DOTALL)
-
-    # Italic (asterisk)
-    text = re.sub(r'\*(.+?)\*', r'\1', text, flags=re.DOTALL)
-
-    # Italic (underscore)
-    text = re.sub(r'_(.+?)_', r'\1', text, flags=re.DOTALL)
-
-    # Strikethrough
-    text = re.sub(r'~~(.+?)~~', r'\1', text, flags=re.DOTALL)
-
-    # Inline code
-    text = re.sub(r'`([^`]+)`', r'\1', text)
+    if '```' in text:
+        text = _RE_CODE_BLOCK.sub('', text)
 
-    # Blockquotes
-    text = re.sub(r'^>\s+', '', text, flags=re.MULTILINE)
+    # Images (before links, as images use similar syntax), then links - keep text
+    if '](' in text:
+        text = _RE_IMG.sub('', text)
+        text = _RE_LINK.sub(r'\1', text)
 
-    # HTML tags
-    text = re.sub(r'<[^>]+>', '', text)
+    # Rules, blockquote markers and HTML tags are dropped; emphasis and
+    # inline code keep their text; headers keep their text with a pause
+    # after. All in a single scan.
+    if '---' in text or any(c in text for c in _MD_MARKERS):
+        text = _RE_MARKDOWN.sub(_replace_markdown, text)
 
     # Sub-headers: lines ending with colon (like "Capabilities:", "Hard restrictions:")
     # Add pause after these for TTS to read them as section introductions
-    text = re.sub(r'^([A-Z][^:\n]*:)\s*$', r'\1\n\n', text, flags=re.MULTILINE)
+    if ':' in text:
+        text = _RE_SUBHEADER.sub(r'\1\n\n', text)
 
     return text
 
@@ -64,39 +143,44 @@ def convert_lists(text: str) -> str:
     Each list item becomes a separate sentence so TTS adds natural pauses.
     Handles ASCII bullets (-, *, +) and Unicode bullets (•, ◦, ▪, ▸, ►, ●, ○).
     """
-    lines = text.split('\n')
-    result_lines = []
-    current_list_items = []
-
-    # ASCII bullets: -, *, +
-    # Unicode bullets: •◦▪▸►●○‣⁃
-    bullet_pattern = re.compile(r'^[\s]*[-*+•◦▪▸►●○‣⁃]\s*(.*)$')
-    number_pattern = re.compile(r'^[\s]*\d+[.)]\s+(.+)$')
-
-    def flush_list():
-        if current_list_items:
-            for item in current_list_items:
-                item = item.strip()
-                if item:
-                    if item[-1] not in '.!?':
-                        item += '.'
-                    result_lines.append(item)
-            current_list_items.clear()
-
-    for line in lines:
-        bullet_match = bullet_pattern.match(line)
-        number_match = number_pattern.match(line)
-
-        if bullet_match:
-            current_list_items.append(bullet_match.group(1))
-        elif number_match:
-            current_list_items.append(number_match.group(1))
-        else:
-            flush_list()
-            result_lines.append(line)
+    if not any(c in text for c in _LIST_BULLETS) and not _RE_NUMBERED_HINT.search(text):
+        return text
+
+    result = _RE_LIST_ITEM.sub(_replace_list_item, text)
+    # A dropped empty item on the last line leaves the previous newline behind
+    if result.endswith('\n') and not text.endswith('\n'):
+        result = result[:-1]
+    return result
+
+
+def _replace_table(match: re.Match) -> str:
+    block = match.group(0)
+    rows = block.split('\n')
+    if block.endswith('\n'):
+        rows.pop()
 
-    flush_list()
-    return '\n'.join(result_lines)
+    # First row is the header row
+    headers = [cell.strip() for cell in rows[0].strip().split('|')[1:-1]]
+    table_prose = []
+
+    for row in rows[1:]:
+        row = row.strip()
+        if _RE_TABLE_SEP.match(row):
+            # Skip separator row (|---|---|)
+            continue
+        # Data row - convert to prose
+        cells = [cell.strip() for cell in row.split('|')[1:-1]]
+        pairs = []
+        for header, value in zip(headers, cells):
+            if value:  # Skip empty values
+                pairs.append(f"{header} is {value}")
+        if pairs:  # Only add row if there are non-empty pairs
+            table_prose.append(', '.join(pairs) + '.')
+
+    if not table_prose:
+        # Drop the table along with its lines
+        return ''
+    return ' '.join(table_prose) + ('\n' if block.endswith('\n') else '')
 
 
 def convert_tables(text: str) -> str:
@@ -109,55 +193,14 @@ def convert_tables(text: str) -> str:
 
     Becomes: "Item is Apple, Price is $2."
     """
-    lines = text.split('\n')
-    result_lines = []
-
-    headers = []
-    in_table = False
-    table_prose = []
-
-    separator_pattern = re.compile(r'^\|[\s\-:|]+\|$')
-
-    def flush_table():
-        nonlocal in_table, headers, table_prose
-        if table_prose:
-            result_lines.append(' '.join(table_prose))
-        in_table = False
-        headers = []
-        table_prose = []
-
-    for line in lines:
-        stripped = line.strip()
-
-        # Check if this is a table row (contains |)
-        if '|' in stripped and stripped.startswith('|') and stripped.endswith('|'):
-            # Parse cells from the row
-            cells = [cell.strip() for cell in stripped.split('|')[1:-1]]
-
-            if not in_table:
-                # First row with | is the header row
-                headers = cells
-                in_table = True
-            elif separator_pattern.match(stripped):
-                # Skip separator row (|---|---|)
-                continue
-            else:
-                # Data row - convert to prose
-                pairs = []
-                for header, value in zip(headers, cells):
-                    if value:  # Skip empty values
-                        pairs.append(f"{header} is {value}")
-                if pairs:  # Only add row if there are non-empty pairs
-                    table_prose.append(', '.join(pairs) + '.')
-        else:
-            # Non-table line
-            flush_table()
-            result_lines.append(line)
-
-    # Flush any remaining table
-    flush_table()
+    if '|' not in text:
+        return text
 
-    return '\n'.join(result_lines)
+    result = _RE_TABLE_BLOCK.sub(_replace_table, text)
+    # A dropped table on the last line leaves the previous newline behind
+    if result.endswith('\n') and not text.endswith('\n'):
+        result = result[:-1]
+    return result
 
 
 # Common abbreviations dictionary
@@ -178,6 +221,13 @@ ABBREVIATIONS = {
     'Blvd.': 'Boulevard',
 }
 
+# Longest first so 'Mrs.' wins over 'Mr.'; the lookbehind keeps 'Devs.' intact
+_ABBR_PATTERN = re.compile(
+    r'(?<![A-Za-z])('
+    + '|'.join(re.escape(k) for k in sorted(ABBREVIATIONS, key=len, reverse=True))
+    + ')'
+)
+
 # Units mapping
 UNITS = {
     'km': 'kilometers',
@@ -192,6 +242,29 @@ UNITS = {
     'in': 'inches',
 }
 
+# Longest first to match 'cm' before 'm'
+_RE_UNITS = re.compile(
+    r'(\d+)(' + '|'.join(sorted(UNITS, key=len, reverse=True)) + r')\b'
+)
+
+MONTH_NAMES = (
+    'January', 'February', 'March', 'April', 'May', 'June',
+    'July', 'August', 'September', 'October', 'November', 'December'
+)
+
+
+# inflect is pure Python and slow; the same ordinals recur throughout a text
+@lru_cache(maxsize=1024)
+def _ordinal_words(num: int) -> str:
+    """21 -> 'twenty-first'."""
+    return p.number_to_words(p.ordinal(num))
+
+
+@lru_cache(maxsize=256)
+def _ordinal_suffix(num: int) -> str:
+    """21 -> '21st'."""
+    return p.ordinal(num)
+
 
 def normalize_text(text: str) -> str:
     """Normalize text for TTS by converting numbers, symbols, and abbreviations to spoken form.
@@ -219,17 +292,18 @@ def normalize_text(text: str) -> str:
             dollar_word = "dollar" if int(dollars) == 1 else "dollars"
             return f"{dollars} {dollar_word}"
 
-    text = re.sub(r'\$(\d+)(?:\.(\d{2}))?', replace_currency, text)
+    if '$' in text:
+        text = _RE_CURRENCY.sub(replace_currency, text)
 
     # Percentages: X%
-    text = re.sub(r'(\d+)%', r'\1 percent', text)
+    if '%' in text:
+        text = _RE_PCT.sub(r'\1 percent', text)
 
     # Ordinals: 1st, 2nd, 3rd, 4th, etc. -> first, second, third, fourth
     def replace_ordinal(match):
-        num = int(match.group(1))
-        return p.number_to_words(p.ordinal(num))
+        return _ordinal_words(int(match.group(1)))
 
-    text = re.sub(r'(\d+)(st|nd|rd|th)\b', replace_ordinal, text)
+    text = _RE_ORDINAL.sub(replace_ordinal, text)
 
     # Units: 10km, 5kg, etc.
     def replace_unit(match):
@@ -238,22 +312,12 @@ def normalize_text(text: str) -> str:
         unit_word = UNITS.get(unit, unit)
         return f"{number} {unit_word}"
 
-    # Build pattern from units keys, sorted by length (longest first to match 'cm' before 'm')
-    units_pattern = '|'.join(sorted(UNITS.keys(), key=len, reverse=True))
-    text = re.sub(rf'(\d+)({units_pattern})\b', replace_unit, text)
+    text = _RE_UNITS.sub(replace_unit, text)
 
-    # Abbreviations - use word boundaries to avoid partial matches
-    for abbr, expansion in ABBREVIATIONS.items():
-        # Escape the period in abbreviation for regex
-        pattern = re.escape(abbr)
-        text = re.sub(pattern, expansion, text)
+    # Abbreviations - one pass over the combined alternation
+    text = _ABBR_PATTERN.sub(lambda m: ABBREVIATIONS[m.group(1)], text)
 
     # Dates: MM/DD/YYYY -> "Month DDth, YYYY"
-    month_names = [
-        'January', 'February', 'March', 'April', 'May', 'June',
-        'July', 'August', 'September', 'October', 'November', 'December'
-    ]
-
     def replace_date(match):
         month = int(match.group(1))
         day = int(match.group(2))
@@ -261,23 +325,22 @@ def normalize_text(text: str) -> str:
         # Validate month is in valid range (1-12)
         if month < 1 or month > 12:
             return match.group(0)
-        month_name = month_names[month - 1]
-        day_ordinal = p.ordinal(day)
+        month_name = MONTH_NAMES[month - 1]
+        day_ordinal = _ordinal_suffix(day)
         return f"{month_name} {day_ordinal}, {year}"
 
-    text = re.sub(r'(\d{1,2})/(\d{1,2})/(\d{4})', replace_date, text)
+    if '/' in text:
+        text = _RE_DATE.sub(replace_date, text)
 
     return text
 
 
 def remove_unspeakable(text: str) -> str:
     """Remove symbols and characters that TTS cannot pronounce."""
-    # Remove geometric shapes, symbols, and other non-speakable Unicode
-    # ○●◯◉■□▪▫▲△▼▽◆◇★☆♦♣♠♥✓✗✔✘→←↑↓⇒⇐⇔│├└┌┐┘┬┴─═║╔╗╚╝╠╣╬
-    text = re.sub(r'[○●◯◉■□▪▫▲△▼▽◆◇★☆♦♣♠♥✓✗✔✘→←↑↓⇒⇐⇔│├└┌┐┘┬┴─═║╔╗╚╝╠╣╬•·©®™°±×÷≠≤≥∞∑∏√∫∂∆∇∈∉⊂⊃∪∩]', '', text)
-    # Remove other common unspeakable characters
-    text = re.sub(r'[🔹🔸🔷🔶📌📍🔗💡⚠️✨🎯📊📈📉]', '', text)
-    return text
+    # Everything in the table is outside ASCII
+    if text.isascii():
+        return text
+    return text.translate(_UNSPEAKABLE_TABLE)
 
 
 def clean_whitespace(text: str) -> str:
@@ -286,36 +349,14 @@ def clean_whitespace(text: str) -> str:
     Single newlines within paragraphs are converted to spaces so TTS reads
     text naturally without pauses at line breaks.
     """
-    # Normalize ALL line-break characters to \n (including PDF artifacts)
-    # \r\n = Windows, \r = old Mac, \x0c = form feed, \x0b = vertical tab
-    # \u2028 = Unicode line separator, \u2029 = Unicode paragraph separator
-    text = text.replace('\r\n', '\n')
-    text = text.replace('\r', '\n')
-    text = text.replace('\x0c', '\n')
-    text = text.replace('\x0b', '\n')
-    text = text.replace('\u2028', '\n')
-    text = text.replace('\u2029', '\n\n')
-
-    # Normalize paragraph breaks to exactly \n\n
-    text = re.sub(r'\n\s*\n', '\n\n', text)
-
-    # Mark paragraph breaks with placeholder
-    PARA_MARKER = '\x00PARA\x00'
-    text = text.replace('\n\n', PARA_MARKER)
-
-    # Convert remaining single newlines to spaces (join lines within paragraph)
-    text = text.replace('\n', ' ')
-
-    # Restore paragraph breaks
-    text = text.replace(PARA_MARKER, '\n\n')
-
-    # Collapse multiple spaces to single
-    text = re.sub(r' {2,}', ' ', text)
-
-    # Clean up spaces around paragraph breaks
-    text = re.sub(r' *\n\n *', '\n\n', text)
-
-    return text.strip()
+    # Normalize ALL line-break characters to \n. \r\n (Windows) goes first
+    # so it stays a single line break rather than a paragraph break.
+    text = text.replace('\r\n', '\n').translate(_LINEBREAK_TABLE)
+
+    # Split on paragraph breaks (blank lines), then collapse every run of
+    # whitespace inside a paragraph - single newlines included - to one space
+    paragraphs = (' '.join(para.split()) for para in _RE_PARA.split(text))
+    return '\n\n'.join(para for para in paragraphs if para)
 
 
 def preprocess_for_tts(text: str) -> str:
@@ -1,6 +1,8 @@
 import os
 import uuid
 import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from flask import Blueprint, jsonify, request, render_template, send_file, current_app
 from werkzeug.utils import secure_filename
@@ -12,17 +14,27 @@ from app.tts import convert_text_to_speech, TTSError
 
 main_bp = Blueprint("main", __name__)
 
-# In-memory job status tracking
-conversion_jobs = {}
+# In-memory job status tracking, shared by request threads and workers.
+# Jobs are inserted in creation order, so the oldest are always at the front.
+conversion_jobs = OrderedDict()
+conversion_jobs_lock = threading.Lock()
+MAX_TRACKED_JOBS = 10000
+
+# Copy uploads to disk in 1 MB reads instead of werkzeug's 16 KB default
+UPLOAD_BUFFER_SIZE = 1024 * 1024
+
+# Conversions queue here instead of each getting its own thread
+conversion_executor = ThreadPoolExecutor(max_workers=Config.TTS_MAX_WORKERS,
+                                         thread_name_prefix="tts")
 
 
 def cleanup_old_jobs():
     """Remove jobs older than 1 hour."""
     cutoff = datetime.utcnow() - timedelta(hours=1)
-    old_jobs = [job_id for job_id, job in conversion_jobs.items()
-                if job.get("created_at", datetime.utcnow()) < cutoff]
-    for job_id in old_jobs:
-        del conversion_jobs[job_id]
+    with conversion_jobs_lock:
+        # Only the expired prefix is visited
+        while conversion_jobs and next(iter(conversion_jobs.values()))["created_at"] < cutoff:
+            conversion_jobs.popitem(last=False)
 
 
 @main_bp.route("/")
@@ -69,7 +81,7 @@ def start_conversion():
         # Save uploaded file
         file_id = str(uuid.uuid4())
         source_path = os.path.join(Config.DATA_DIR, "sources", f"{file_id}{ext}")
-        file.save(source_path)
+        file.save(source_path, buffer_size=UPLOAD_BUFFER_SIZE)
 
         try:
             text = extract_text_from_file(source_path)
@@ -108,7 +120,7 @@ def start_conversion():
     job_id = str(uuid.uuid4())
     audio_path = os.path.join(Config.DATA_DIR, "audio", f"{job_id}.mp3")
 
-    conversion_jobs[job_id] = {
+    job = {
         "status": "processing",
         "progress": 0,
         "total_chunks": 0,
@@ -116,14 +128,20 @@ def start_conversion():
         "error": None,
         "created_at": datetime.utcnow()
     }
-
-    # Start conversion in background
+    with conversion_jobs_lock:
+        conversion_jobs[job_id] = job
+        # Bound memory even when jobs arrive faster than they expire
+        while len(conversion_jobs) > MAX_TRACKED_JOBS:
+            conversion_jobs.popitem(last=False)
+
+    # Start conversion in background. The worker updates its own job dict,
+    # so it is unaffected if cleanup drops the entry while it is queued.
     def run_conversion():
         try:
             def progress_callback(current, total):
-                conversion_jobs[job_id]["current_chunk"] = current
-                conversion_jobs[job_id]["total_chunks"] = total
-                conversion_jobs[job_id]["progress"] = int((current / total) * 100)
+                job["current_chunk"] = current
+                job["total_chunks"] = total
+                job["progress"] = int((current / total) * 100)
 
             # Check storage and cleanup if needed
             cleanup_if_needed(len(text) * 10)  # Rough estimate
@@ -137,6 +155,7 @@ def start_conversion():
             )
 
             audio_size = os.path.getsize(audio_path)
+            source_size = os.path.getsize(source_path)
 
             # Save to database
             conversion = Conversion.create(
@@ -148,22 +167,22 @@ def start_conversion():
                 speed=speed,
                 audio_path=audio_path,
                 audio_duration=duration,
-                audio_size=audio_size
+                audio_size=audio_size,
+                source_size=source_size
             )
 
-            conversion_jobs[job_id]["status"] = "completed"
-            conversion_jobs[job_id]["result_id"] = conversion.id
-            conversion_jobs[job_id]["progress"] = 100
+            job["status"] = "completed"
+            job["result_id"] = conversion.id
+            job["progress"] = 100
 
         except TTSError as e:
-            conversion_jobs[job_id]["status"] = "failed"
-            conversion_jobs[job_id]["error"] = str(e)
+            job["status"] = "failed"
+            job["error"] = str(e)
         except Exception as e:
-            conversion_jobs[job_id]["status"] = "failed"
-            conversion_jobs[job_id]["error"] = f"Unexpected error: {str(e)}"
+            job["status"] = "failed"
+            job["error"] = f"Unexpected error: {str(e)}"
 
-    thread = threading.Thread(target=run_conversion)
-    thread.start()
+    conversion_executor.submit(run_conversion)
 
     return jsonify({
         "job_id": job_id,
@@ -174,10 +193,11 @@ def start_conversion():
 
 @main_bp.route("/api/status/<job_id>")
 def get_status(job_id):
-    if job_id not in conversion_jobs:
+    with conversion_jobs_lock:
+        job = conversion_jobs.get(job_id)
+    if job is None:
         return jsonify({"error": "Job not found"}), 404
 
-    job = conversion_jobs[job_id]
     return jsonify({
         "status": job["status"],
         "progress": job["progress"],
@@ -215,7 +235,12 @@ def get_audio(conversion_id):
         conversion.audio_path,
         mimetype="audio/mpeg",
         as_attachment=request.args.get("download") == "1",
-        download_name=f"tinytts-{conversion.id[:8]}.mp3"
+        download_name=f"tinytts-{conversion.id[:8]}.mp3",
+        # Revalidate with ETag/Last-Modified and serve Range requests for seeking;
+        # a conversion's audio never changes, so let clients cache it
+        conditional=True,
+        etag=True,
+        max_age=3600
     )
 
 
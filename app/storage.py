@@ -1,22 +1,25 @@
 import os
+import threading
 from app.config import Config
 from app.models import Conversion
+from app.tts_cache import evict_cache, get_cache_size_bytes
 
+# Oldest conversions fetched per query when freeing space
+CLEANUP_BATCH_SIZE = 100
+
+# Conversions run concurrently; two cleanups measuring the same usage would
+# each delete enough history to cover it
+_cleanup_lock = threading.Lock()
 
-def get_storage_usage_bytes() -> int:
-    """Calculate total storage used by audio and source files."""
-    total = 0
-    data_dir = Config.DATA_DIR
 
-    for subdir in ["audio", "sources"]:
-        dir_path = os.path.join(data_dir, subdir)
-        if os.path.exists(dir_path):
-            for filename in os.listdir(dir_path):
-                filepath = os.path.join(dir_path, filename)
-                if os.path.isfile(filepath):
-                    total += os.path.getsize(filepath)
+def get_storage_usage_bytes() -> int:
+    """Total storage used by saved conversions and the TTS audio cache.
 
-    return total
+    Conversions are counted from their recorded file sizes rather than by
+    walking the data directory; the sum is cached until a conversion is
+    saved or deleted.
+    """
+    return Conversion.total_storage_bytes() + get_cache_size_bytes()
 
 
 def get_storage_usage_gb() -> float:
@@ -25,7 +28,7 @@ def get_storage_usage_gb() -> float:
 
 
 def cleanup_if_needed(required_bytes: int = 0) -> int:
-    """Delete oldest entries until storage is under limit.
+    """Evict cached audio, then delete oldest entries, until storage is under limit.
 
     Args:
         required_bytes: Additional bytes needed for new file
@@ -36,27 +39,44 @@ def cleanup_if_needed(required_bytes: int = 0) -> int:
     max_bytes = Config.MAX_STORAGE_GB * (1024 ** 3)
     deleted_count = 0
 
-    while get_storage_usage_bytes() + required_bytes > max_bytes:
-        oldest = Conversion.get_oldest()
-        if not oldest:
-            break
-
-        # Delete files
-        if os.path.exists(oldest.audio_path):
-            os.remove(oldest.audio_path)
-        if os.path.exists(oldest.source_path):
-            os.remove(oldest.source_path)
-
-        # Delete database record
-        oldest.delete()
-        deleted_count += 1
+    with _cleanup_lock:
+        # Cached audio can be synthesized again, so it goes before history
+        need = get_storage_usage_bytes() + required_bytes - max_bytes
+        if need > 0:
+            evict_cache(need)
+
+        while True:
+            # Re-measured every batch rather than counted down from one reading
+            need = get_storage_usage_bytes() + required_bytes - max_bytes
+            if need <= 0:
+                break
+            oldest = Conversion.get_oldest_n(CLEANUP_BATCH_SIZE)
+            if not oldest:
+                break
+
+            # Take just enough of the oldest entries to get back under the limit
+            to_delete = []
+            for conversion in oldest:
+                to_delete.append(conversion)
+                need -= conversion.audio_size + conversion.source_size
+                if need <= 0:
+                    break
+
+            for conversion in to_delete:
+                delete_conversion_files(conversion)
+
+            # Delete database records in one statement
+            Conversion.delete_ids([conversion.id for conversion in to_delete])
+            deleted_count += len(to_delete)
 
     return deleted_count
 
 
 def delete_conversion_files(conversion: Conversion):
     """Delete files associated with a conversion."""
-    if os.path.exists(conversion.audio_path):
-        os.remove(conversion.audio_path)
-    if os.path.exists(conversion.source_path):
-        os.remove(conversion.source_path)
+    # One unlink per file; a missing file is fine
+    for path in (conversion.audio_path, conversion.source_path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
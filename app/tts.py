@@ -1,19 +1,41 @@
 import os
-import re
-import tempfile
+import string
+import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from typing import Optional, Callable
 import openai
-from pydub import AudioSegment
+from app.audio import append_mp3
 from app.config import Config
 from app.chunker import chunk_text, split_into_sentences
 from app.preprocessor import preprocess_for_tts
+from app.tts_cache import cache_key, get_cached_audio, store_cached_audio
 
 MAX_RETRIES = 3
 RETRY_DELAY = 1.0  # seconds
+STREAM_CHUNK_SIZE = 64 * 1024  # bytes read per iteration of a TTS response
+REQUEST_TIMEOUT = 60.0  # seconds per TTS request
+CONNECT_TIMEOUT = 5.0  # seconds to open a connection to the TTS backend
+# Sizes to retry at, in order, when a chunk fails at the preferred size
+FALLBACK_CHUNK_SIZES = (2000, 1000, Config.MIN_CHUNK_SIZE)
 MIN_SPEAKABLE_CHARS = 3  # Minimum alphanumeric characters for valid TTS input
 MIN_SPEAKABLE_LETTERS = 2  # Minimum letters for readable words
 
+# Only ASCII letters and digits count as speakable content
+_LETTERS = frozenset(string.ascii_letters)
+_DIGITS = frozenset(string.digits)
+
+# Shared by all conversions, so this also caps concurrent requests to the
+# TTS backend
+_chunk_executor = ThreadPoolExecutor(max_workers=Config.TTS_CHUNK_PARALLELISM,
+                                     thread_name_prefix="tts-chunk")
+
+# One client for the whole process so its connection pool is reused
+_tts_client: Optional[openai.OpenAI] = None
+_tts_client_lock = threading.Lock()
+
 
 class TTSError(Exception):
     """TTS processing error."""
@@ -27,17 +49,18 @@ class ValidationError(TTSError):
 
 def is_chunk_valid(chunk: str) -> bool:
     """Check if a chunk is valid for TTS processing."""
-    if not chunk or not chunk.strip():
-        return False
-    # Must have minimum alphanumeric content
-    alphanumeric = re.sub(r'[^a-zA-Z0-9]', '', chunk)
-    if len(alphanumeric) < MIN_SPEAKABLE_CHARS:
-        return False
-    # Must have actual letters (not just numbers)
-    letters = re.sub(r'[^a-zA-Z]', '', chunk)
-    if len(letters) < MIN_SPEAKABLE_LETTERS:
-        return False
-    return True
+    # Must have minimum alphanumeric content, including actual letters (not
+    # just numbers). Counted in one pass that stops once both are satisfied.
+    alphanumeric = letters = 0
+    for ch in chunk:
+        if ch in _LETTERS:
+            letters += 1
+        elif ch not in _DIGITS:
+            continue
+        alphanumeric += 1
+        if alphanumeric >= MIN_SPEAKABLE_CHARS and letters >= MIN_SPEAKABLE_LETTERS:
+            return True
+    return False
 
 
 def repair_chunks(chunks: list[str], max_chunk_size: int) -> list[str]:
@@ -83,18 +106,21 @@ def repair_chunks(chunks: list[str], max_chunk_size: int) -> list[str]:
 
         # Check if chunk is too long
         if len(chunk) > max_chunk_size:
-            # Split by sentences
-            sentences = split_into_sentences(chunk)
-            current = ""
-            for sent in sentences:
-                if not sent.strip():
-                    continue
-                if len(current) + len(sent) + 1 <= max_chunk_size:
-                    current = (current + " " + sent).strip() if current else sent
+            # Split by sentences (already stripped and non-empty), collecting
+            # them in a list and joining once per piece
+            parts = []
+            current_len = 0  # len(" ".join(parts))
+            for sent in split_into_sentences(chunk):
+                if current_len + len(sent) + 1 <= max_chunk_size:
+                    current_len += len(sent) + 1 if parts else len(sent)
+                    parts.append(sent)
                 else:
+                    current = " ".join(parts)
                     if current and is_chunk_valid(current):
                         repaired.append(current)
-                    current = sent
+                    parts = [sent]
+                    current_len = len(sent)
+            current = " ".join(parts)
             if current:
                 if is_chunk_valid(current):
                     repaired.append(current)
@@ -113,121 +139,137 @@ def repair_chunks(chunks: list[str], max_chunk_size: int) -> list[str]:
 def validate_and_repair_chunks(chunks: list[str], max_chunk_size: int = None) -> list[str]:
     """Validate all chunks and repair any invalid ones.
 
-    Two-pass approach:
-    1. First pass: repair invalid chunks (merge/split)
-    2. Second pass: final validation, drop any remaining invalid
+    repair_chunks only emits chunks that passed is_chunk_valid (a merge
+    keeps every character of the valid chunk it extends), so no second
+    validation pass is needed.
     """
     if max_chunk_size is None:
         max_chunk_size = Config.INITIAL_CHUNK_SIZE
 
-    # First pass: repair
     repaired = repair_chunks(chunks, max_chunk_size)
 
-    # Second pass: final validation
-    final_chunks = []
-    for chunk in repaired:
-        if is_chunk_valid(chunk):
-            final_chunks.append(chunk)
-
-    if not final_chunks:
+    if not repaired:
         raise ValidationError("No valid chunks after repair. Input may not contain speakable text.")
 
-    return final_chunks
+    return repaired
 
 
 def get_tts_client() -> openai.OpenAI:
-    """Create OpenAI client configured for LiteLLM."""
+    """Return the shared OpenAI client configured for LiteLLM."""
+    global _tts_client
     if not Config.LITELLM_API_KEY:
         raise TTSError("LITELLM_API_KEY not configured")
 
-    return openai.OpenAI(
-        api_key=Config.LITELLM_API_KEY,
-        base_url=Config.LITELLM_BASE_URL
-    )
+    with _tts_client_lock:
+        if _tts_client is None:
+            _tts_client = openai.OpenAI(
+                api_key=Config.LITELLM_API_KEY,
+                base_url=Config.LITELLM_BASE_URL,
+                # Give up quickly on an unreachable backend so the retry
+                # loop can try again, but allow slow synthesis
+                timeout=openai.Timeout(REQUEST_TIMEOUT, connect=CONNECT_TIMEOUT),
+                # fetch_chunk_audio does its own retries
+                max_retries=0
+            )
+        return _tts_client
+
 
+def fetch_chunk_audio(client: openai.OpenAI, text: str, voice: str, speed: float,
+                      cancelled: Optional[threading.Event] = None) -> Optional[bytes]:
+    """Convert a single text chunk to MP3 audio in memory with retry logic.
 
-def convert_chunk(client: openai.OpenAI, text: str, voice: str,
-                  speed: float, output_path: str) -> bool:
-    """Convert a single text chunk to audio with retry logic.
+    No further requests are made once cancelled is set.
 
     Returns:
-        True if successful, False otherwise
+        The MP3 data if successful, None otherwise
     """
+    # Repeated passages (and re-runs of a document) are served from disk
+    key = cache_key(text, voice, speed, Config.TTS_MODEL)
+    audio = get_cached_audio(key)
+    if audio is not None:
+        return audio
+
     for attempt in range(MAX_RETRIES):
+        if cancelled is not None and cancelled.is_set():
+            return None
         try:
-            response = client.audio.speech.create(
+            with client.audio.speech.with_streaming_response.create(
                 model=Config.TTS_MODEL,
                 input=text,
                 voice=voice,
                 speed=speed
-            )
-            response.stream_to_file(output_path)
-
-            # Validate the output file
-            if not os.path.exists(output_path):
-                if attempt < MAX_RETRIES - 1:
-                    time.sleep(RETRY_DELAY * (attempt + 1))
-                    continue
-                return False
-
-            file_size = os.path.getsize(output_path)
-            if file_size < 100:  # Too small to be valid audio
-                if attempt < MAX_RETRIES - 1:
-                    time.sleep(RETRY_DELAY * (attempt + 1))
-                    continue
-                return False
-
-            # Check for valid MP3/ID3 header
-            with open(output_path, 'rb') as f:
-                header = f.read(3)
-                # Valid MP3 starts with ID3 tag or MP3 frame sync
-                if header != b'ID3' and header[:2] != b'\xff\xfb':
-                    if attempt < MAX_RETRIES - 1:
-                        time.sleep(RETRY_DELAY * (attempt + 1))
-                        continue
-                    return False
+            ) as response:
+                pieces = response.iter_bytes(STREAM_CHUNK_SIZE)
+                head = b''
+                for piece in pieces:
+                    head += piece
+                    if len(head) >= 3:
+                        break
 
-            return True
+                # Valid MP3 starts with ID3 tag or MP3 frame sync. Check that
+                # as soon as it arrives so a bad response isn't downloaded.
+                if head[:3] == b'ID3' or head[:2] == b'\xff\xfb':
+                    audio = head + b''.join(pieces)
+                else:
+                    audio = b''
         except Exception:
-            if attempt < MAX_RETRIES - 1:
-                time.sleep(RETRY_DELAY * (attempt + 1))
-                continue
-            return False
+            audio = b''
+
+        if len(audio) >= 100:  # Smaller is too small to be valid audio
+            store_cached_audio(key, audio)
+            return audio
+
+        if attempt < MAX_RETRIES - 1:
+            time.sleep(RETRY_DELAY * (attempt + 1))
+
+    return None
+
+
+def _convert_at_size(client: openai.OpenAI, chunk: str, voice: str, speed: float,
+                     size: int, cancelled: Optional[threading.Event]) -> Optional[list[bytes]]:
+    """Convert a chunk whole if it fits in size, else as sub-chunks of size."""
+    if len(chunk) <= size:
+        audio = fetch_chunk_audio(client, chunk, voice, speed, cancelled)
+        return [audio] if audio is not None else None
+
+    # Need to sub-chunk
+    sub_parts = []
+    for sub_chunk in chunk_text(chunk, size):
+        audio = fetch_chunk_audio(client, sub_chunk, voice, speed, cancelled)
+        if audio is None:
+            return None
+        sub_parts.append(audio)
+    return sub_parts or None
 
-    return False
 
+def convert_chunk_parts(client: openai.OpenAI, chunk: str, voice: str, speed: float,
+                        preferred_size: int,
+                        cancelled: Optional[threading.Event] = None) -> tuple[Optional[list[bytes]], int]:
+    """Convert a validated chunk, splitting it smaller if the TTS API fails.
 
-def convert_chunk_adaptive(client: openai.OpenAI, text: str, voice: str,
-                           speed: float, output_path: str) -> tuple[bool, int]:
-    """Convert text chunk with adaptive chunk size reduction on failure.
+    Gives up without further requests once cancelled is set.
 
     Returns:
-        Tuple of (success, chunk_size_used)
+        Tuple of (audio for each piece in order, chunk size used),
+        or (None, 0) if every size failed
     """
-    chunk_sizes = [
-        Config.INITIAL_CHUNK_SIZE,
-        2000,
-        1000,
-        Config.MIN_CHUNK_SIZE
-    ]
-
-    for size in chunk_sizes:
-        if len(text) <= size:
-            if convert_chunk(client, text, voice, speed, output_path):
-                return True, size
-
-        # Text is larger than this size, try chunking at this size
-        chunks = list(chunk_text(text, size))
-        if len(chunks) == 1:
-            if convert_chunk(client, text, voice, speed, output_path):
-                return True, size
+    # Fast path: nearly every chunk converts at the preferred size first time
+    parts = _convert_at_size(client, chunk, voice, speed, preferred_size, cancelled)
+    if parts:
+        return parts, preferred_size
+
+    for size in FALLBACK_CHUNK_SIZES:
+        if cancelled is not None and cancelled.is_set():
+            break
+        # Once a chunk has shrunk to a fallback size, don't chunk and send it
+        # at that size a second time
+        if size == preferred_size:
             continue
+        parts = _convert_at_size(client, chunk, voice, speed, size, cancelled)
+        if parts:
+            return parts, size
 
-        # Multiple chunks at this size - this shouldn't happen in single chunk conversion
-        # Fall through to try smaller size
-        continue
-
-    return False, 0
+    return None, 0
 
 
 def convert_text_to_speech(
@@ -273,75 +315,50 @@ def convert_text_to_speech(
     # Step 4: Now safe to start TTS processing - all chunks are validated
     client = get_tts_client()
 
-    temp_files = []
+    # Chunks that needed a smaller size make the next ones start there
     successful_chunk_size = Config.INITIAL_CHUNK_SIZE
+    # Set on failure so chunks already running stop calling the backend
+    cancelled = threading.Event()
+
+    def convert(chunk):
+        nonlocal successful_chunk_size
+        parts, size = convert_chunk_parts(client, chunk, voice, speed,
+                                          successful_chunk_size, cancelled)
+        if parts:
+            successful_chunk_size = size
+        return parts
+
+    # Chunks are converted concurrently but written in order. Only a window
+    # of them is submitted ahead so finished audio can't pile up in memory.
+    window = Config.TTS_CHUNK_PARALLELISM * 2
+    remaining = iter(chunks)
+    pending = deque(_chunk_executor.submit(convert, chunk)
+                    for chunk in islice(remaining, window))
+    duration = 0.0
 
     try:
-        for i, chunk in enumerate(chunks):
-            if progress_callback:
-                progress_callback(i + 1, total_chunks)
-
-            # Create temp file for this chunk
-            temp_fd, temp_path = tempfile.mkstemp(suffix=".mp3")
-            os.close(temp_fd)
-            temp_files.append(temp_path)
-
-            # Try conversion with adaptive sizing
-            success = False
-            chunk_sizes = [successful_chunk_size, 2000, 1000, Config.MIN_CHUNK_SIZE]
-
-            for size in chunk_sizes:
-                if len(chunk) <= size:
-                    if convert_chunk(client, chunk, voice, speed, temp_path):
-                        success = True
-                        successful_chunk_size = size
-                        break
-                else:
-                    # Need to sub-chunk
-                    sub_chunks = list(chunk_text(chunk, size))
-                    sub_success = True
-                    sub_segments = []
-
-                    for sub_chunk in sub_chunks:
-                        sub_fd, sub_path = tempfile.mkstemp(suffix=".mp3")
-                        os.close(sub_fd)
-
-                        if convert_chunk(client, sub_chunk, voice, speed, sub_path):
-                            sub_segments.append(AudioSegment.from_mp3(sub_path))
-                            os.remove(sub_path)
-                        else:
-                            os.remove(sub_path)
-                            sub_success = False
-                            break
-
-                    if sub_success and sub_segments:
-                        combined = sub_segments[0]
-                        for seg in sub_segments[1:]:
-                            combined += seg
-                        combined.export(temp_path, format="mp3")
-                        success = True
-                        successful_chunk_size = size
-                        break
-
-            if not success:
-                raise TTSError(f"Failed to convert chunk {i + 1}/{total_chunks}")
-
-        # Concatenate all chunks
-        if len(temp_files) == 1:
-            os.rename(temp_files[0], output_path)
-            temp_files = []
-        else:
-            combined = AudioSegment.from_mp3(temp_files[0])
-            for temp_file in temp_files[1:]:
-                combined += AudioSegment.from_mp3(temp_file)
-            combined.export(output_path, format="mp3")
-
-        # Get duration
-        final_audio = AudioSegment.from_mp3(output_path)
-        return len(final_audio) / 1000.0  # Convert ms to seconds
-
-    finally:
-        # Clean up temp files
-        for temp_file in temp_files:
-            if os.path.exists(temp_file):
-                os.remove(temp_file)
+        with open(output_path, 'wb') as out:
+            for i in range(total_chunks):
+                parts = pending.popleft().result()
+                for chunk in islice(remaining, 1):
+                    pending.append(_chunk_executor.submit(convert, chunk))
+
+                if not parts:
+                    raise TTSError(f"Failed to convert chunk {i + 1}/{total_chunks}")
+
+                # MP3 frames can be appended as-is, no re-encoding
+                for audio in parts:
+                    duration += append_mp3(out, audio)
+
+                if progress_callback:
+                    progress_callback(i + 1, total_chunks)
+    except BaseException:
+        cancelled.set()
+        for future in pending:
+            future.cancel()
+        # Don't leave a partial file behind
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        raise
+
+    return duration
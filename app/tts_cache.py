@@ -0,0 +1,130 @@
+"""On-disk cache of synthesized chunk audio, keyed by the TTS request."""
+import hashlib
+import os
+import threading
+from typing import Optional
+from app.config import Config
+
+# Running size of the cache directory; loaded on the first store
+_cache_bytes = None
+_cache_lock = threading.Lock()
+
+# Eviction frees down to this fraction of the limit so it doesn't run on every store
+EVICT_TO_FRACTION = 0.9
+
+
+def get_cache_dir() -> str:
+    return os.path.join(Config.DATA_DIR, "tts_cache")
+
+
+def cache_key(text: str, voice: str, speed: float, model: str) -> str:
+    """Key identifying one TTS request."""
+    return hashlib.blake2b(f"{model}|{voice}|{speed}|{text}".encode(), digest_size=16).hexdigest()
+
+
+def _cache_path(key: str) -> str:
+    return os.path.join(get_cache_dir(), f"{key}.mp3")
+
+
+def get_cached_audio(key: str) -> Optional[bytes]:
+    """Return cached audio for key, or None on a miss."""
+    if Config.TTS_CACHE_MAX_MB <= 0:
+        return None
+    path = _cache_path(key)
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+        # Mark as recently used for eviction
+        os.utime(path)
+    except OSError:
+        return None
+    return data
+
+
+def store_cached_audio(key: str, data: bytes):
+    """Add audio to the cache, evicting least recently used entries if full.
+
+    The cache is best-effort: write and eviction failures are ignored.
+    """
+    global _cache_bytes
+    max_bytes = Config.TTS_CACHE_MAX_MB * 1024 * 1024
+    if max_bytes <= 0:
+        return
+
+    path = _cache_path(key)
+    # Write under a temporary name so readers never see a partial file
+    temp_path = f"{path}.{threading.get_ident()}.tmp"
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except OSError:
+        return
+
+    with _cache_lock:
+        try:
+            if _cache_bytes is None:
+                _cache_bytes = sum(size for _, _, size in _scan_cache())
+            else:
+                _cache_bytes += len(data)
+            if _cache_bytes > max_bytes:
+                _cache_bytes = _evict(int(max_bytes * EVICT_TO_FRACTION))
+        except OSError:
+            # Recount on the next store
+            _cache_bytes = None
+
+
+def get_cache_size_bytes() -> int:
+    """Total size of the cached audio files."""
+    global _cache_bytes
+    with _cache_lock:
+        if _cache_bytes is None:
+            _cache_bytes = sum(size for _, _, size in _scan_cache())
+        return _cache_bytes
+
+
+def evict_cache(bytes_to_free: int) -> int:
+    """Delete least recently used entries until bytes_to_free are freed.
+
+    Returns:
+        Bytes actually freed
+    """
+    global _cache_bytes
+    with _cache_lock:
+        total = sum(size for _, _, size in _scan_cache())
+        _cache_bytes = _evict(max(total - bytes_to_free, 0))
+        return total - _cache_bytes
+
+
+def _scan_cache() -> list[tuple[float, str, int]]:
+    """(mtime, path, size) for every cached file."""
+    entries = []
+    with os.scandir(get_cache_dir()) as it:
+        for entry in it:
+            if entry.name.endswith(".mp3"):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    # Evicted by another process since the listing
+                    continue
+                entries.append((stat.st_mtime, entry.path, stat.st_size))
+    return entries
+
+
+def _evict(target_bytes: int) -> int:
+    """Delete least recently used entries until at most target_bytes remain.
+
+    Returns:
+        Bytes remaining in the cache
+    """
+    entries = sorted(_scan_cache())
+    total = sum(size for _, _, size in entries)
+    for _, path, size in entries:
+        if total <= target_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+    return total
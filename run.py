@@ -4,7 +4,8 @@ load_dotenv()
 from app import create_app
 from app.config import Config
 
-app = create_app()
-
 if __name__ == "__main__":
+    # Only when run as a script: PDF extraction worker processes import this
+    # module too, and must not initialize the app and database
+    app = create_app()
     app.run(host=Config.HOST, port=Config.PORT, debug=True)
@@ -0,0 +1,34 @@
+import io
+import pytest
+from app.audio import append_mp3
+
+# MPEG-1 Layer III, 128 kbps, 44.1 kHz, no padding: 417-byte frames of 1152 samples
+FRAME_HEADER = b'\xff\xfb\x90\x64'
+FRAME = FRAME_HEADER + b'\x00' * 413
+FRAME_SECONDS = 1152 / 44100
+INFO_FRAME = FRAME_HEADER + b'\x00' * 32 + b'Info' + b'\x00' * 377
+ID3_TAG = b'ID3\x04\x00\x00\x00\x00\x00\x05' + b'\x00' * 5
+
+
+class TestAppendMp3:
+    def test_counts_frames(self):
+        out = io.BytesIO()
+        assert append_mp3(out, FRAME * 10) == pytest.approx(10 * FRAME_SECONDS)
+        assert out.getvalue() == FRAME * 10
+
+    def test_skips_tags_and_vbr_header(self):
+        out = io.BytesIO()
+        duration = append_mp3(out, ID3_TAG + INFO_FRAME + FRAME * 4)
+        assert duration == pytest.approx(4 * FRAME_SECONDS)
+        assert out.getvalue() == FRAME * 4
+
+    def test_joins_files(self):
+        out = io.BytesIO()
+        append_mp3(out, ID3_TAG + INFO_FRAME + FRAME * 3)
+        append_mp3(out, ID3_TAG + INFO_FRAME + FRAME * 2)
+        assert out.getvalue() == FRAME * 5
+
+    def test_drops_bytes_between_frames(self):
+        out = io.BytesIO()
+        append_mp3(out, FRAME + b'junk' + FRAME + b'TAG')
+        assert out.getvalue() == FRAME * 2
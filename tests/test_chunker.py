@@ -0,0 +1,52 @@
+from app.chunker import is_valid_chunk, count_alnum, split_into_sentences, chunk_text
+
+
+class TestIsValidChunk:
+    def test_requires_three_alphanumerics(self):
+        assert is_valid_chunk("abc")
+        assert is_valid_chunk("a1b")
+        assert not is_valid_chunk("ab")
+
+    def test_ignores_punctuation_and_whitespace(self):
+        assert not is_valid_chunk("")
+        assert not is_valid_chunk("   \n\t ")
+        assert not is_valid_chunk("... !!! ---")
+        assert is_valid_chunk("  a . b . c  ")
+
+    def test_ignores_non_ascii_letters(self):
+        assert not is_valid_chunk("éèê ●●●")
+
+
+class TestCountAlnum:
+    def test_counts_ascii_letters_and_digits(self):
+        assert count_alnum("a1 b2, c3!") == 6
+        assert count_alnum("... ●●") == 0
+
+
+class TestSplitIntoSentences:
+    def test_keeps_punctuation_with_sentence(self):
+        assert split_into_sentences("One. Two! Three? Four") == ["One.", "Two!", "Three?", "Four"]
+
+    def test_requires_whitespace_after_punctuation(self):
+        assert split_into_sentences("Version 1.2 is out.  Next") == ["Version 1.2 is out.", "Next"]
+
+    def test_drops_empty_sentences(self):
+        assert split_into_sentences("  ") == []
+
+
+class TestChunkText:
+    def test_short_paragraphs_pass_through(self):
+        text = "First paragraph.\n\nSecond paragraph."
+        assert list(chunk_text(text, 100)) == ["First paragraph.", "Second paragraph."]
+
+    def test_long_paragraph_split_on_sentences(self):
+        text = "One two three. Four five six. Seven eight nine."
+        assert list(chunk_text(text, 30)) == ["One two three. Four five six.", "Seven eight nine."]
+
+    def test_skips_punctuation_only_sentences(self):
+        text = "One two three. ... Four five six."
+        assert list(chunk_text(text, 20)) == ["One two three.", "Four five six."]
+
+    def test_splits_overlong_sentence(self):
+        text = "abcdefghij" * 3
+        assert list(chunk_text(text, 10)) == ["abcdefghij"] * 3
@@ -0,0 +1,48 @@
+import os
+from concurrent.futures.process import BrokenProcessPool
+import pymupdf
+import pymupdf4llm
+import pytest
+from app import extractors
+from app.extractors import extract_from_pdf
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    path = str(tmp_path / "doc.pdf")
+    with pymupdf.open() as doc:
+        for number in range(1, 65):
+            page = doc.new_page()
+            page.insert_text((72, 72), f"Chapter {number}", fontsize=20)
+            page.insert_text((72, 120), f"This is the text of page {number}.", fontsize=11)
+        doc.save(path)
+    return path
+
+
+@pytest.fixture
+def pdf_executor(monkeypatch):
+    # Enough cores for the parallel path, and a pool of this test's own
+    monkeypatch.setattr(os, "cpu_count", lambda: 4)
+    monkeypatch.setattr(extractors, "_pdf_executor", None)
+    yield
+    if extractors._pdf_executor is not None:
+        extractors._pdf_executor.shutdown()
+
+
+class TestExtractFromPdf:
+    def test_parallel_matches_single_call(self, pdf_path, pdf_executor):
+        text = extract_from_pdf(pdf_path)
+        assert extractors._pdf_executor is not None
+        assert text == pymupdf4llm.to_markdown(pdf_path).strip()
+        assert text.startswith("# Chapter 1") and text.endswith("page 64.")
+
+    def test_recovers_from_broken_pool(self, pdf_path, pdf_executor):
+        # A worker exiting breaks the pool, as a crash or OOM kill would
+        broken = extractors._get_pdf_executor()
+        with pytest.raises(BrokenProcessPool):
+            broken.submit(os._exit, 1).result()
+
+        text = extract_from_pdf(pdf_path)
+        assert text.startswith("# Chapter 1") and text.endswith("page 64.")
+        assert extractors._pdf_executor is None
+        assert extractors._get_pdf_executor() is not broken
@@ -26,6 +26,12 @@ class TestStripMarkdown:
         text = "before\n```python\ncode here\n```\nafter"
         assert strip_markdown(text) == "before\n\nafter"
 
+    def test_removes_code_blocks_after_emphasis_marker(self):
+        text = "Set the max_size option:\n```\nconfig.max_size = 10\n```\nDone."
+        assert strip_markdown(text) == "Set the max_size option:\n\n\nDone."
+        text = "Run this *now:\n```\nrm -rf *\n```"
+        assert "rm -rf" not in strip_markdown(text)
+
     def test_removes_horizontal_rules(self):
         assert strip_markdown("above\n---\nbelow") == "above\n\nbelow"
         assert strip_markdown("above\n***\nbelow") == "above\n\nbelow"
@@ -34,6 +40,12 @@ class TestStripMarkdown:
     def test_keeps_link_text(self):
         assert strip_markdown("[click here](http://url)") == "click here"
 
+    def test_keeps_link_text_after_underscores(self):
+        text = "Set file_name in [the docs](http://example.com/my_page) now."
+        assert strip_markdown(text) == "Set file_name in the docs now."
+        text = "Use snake_case vars, see [guide](https://x.io/a_b)."
+        assert strip_markdown(text) == "Use snake_case vars, see guide."
+
     def test_removes_images(self):
         assert strip_markdown("![alt](image.png)") == ""
 
@@ -52,6 +64,13 @@ class TestStripMarkdown:
         text = "*italic\ntext*"
         assert strip_markdown(text) == "italic\ntext"
 
+    def test_handles_nested_markup(self):
+        assert strip_markdown("[**bold link**](http://url)") == "bold link"
+        assert strip_markdown("**bold _and italic_**") == "bold and italic"
+
+    def test_inline_code_keeps_underscores_across_spans(self):
+        assert strip_markdown("`MAX_SIZE` and `MIN_SIZE`") == "MAX_SIZE and MIN_SIZE"
+
 
 class TestConvertLists:
     def test_converts_bullet_list(self):
@@ -175,6 +194,11 @@ class TestNormalizeText:
         assert normalize_text("e.g.") == "for example"
         assert normalize_text("i.e.") == "that is"
 
+    def test_abbreviations_need_word_start(self):
+        """Abbreviations glued to a preceding word are left alone."""
+        assert normalize_text("Devs. and Dr. Who") == "Devs. and Doctor Who"
+        assert normalize_text("(Ave.)") == "(Avenue)"
+
     def test_units(self):
         """Units should be converted to spoken form."""
         assert normalize_text("10km") == "10 kilometers"
@@ -232,6 +256,13 @@ class TestCleanWhitespace:
         """Mixed whitespace issues should all be cleaned."""
         assert clean_whitespace("  a  \n\n  b  ") == "a\n\nb"
 
+    def test_line_break_characters(self):
+        """Windows/PDF line breaks join lines; paragraph separators split them."""
+        assert clean_whitespace("a\r\nb") == "a b"
+        assert clean_whitespace("a\x0cb\u2028c") == "a b c"
+        assert clean_whitespace("a\u2029b") == "a\n\nb"
+        assert clean_whitespace("a\t\tb") == "a b"
+
 
 class TestPreprocessForTts:
     """Tests for preprocess_for_tts main pipeline."""
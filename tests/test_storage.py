@@ -0,0 +1,83 @@
+import os
+import threading
+import pytest
+from app import database, models, storage, tts_cache
+from app.config import Config
+from app.database import close_connection, init_db
+from app.models import Conversion
+from app.storage import cleanup_if_needed, get_storage_usage_bytes
+
+GB = 1024 ** 3
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(models, "_storage_bytes", None)
+    monkeypatch.setattr(tts_cache, "_cache_bytes", None)
+    os.makedirs(tmp_path / "tts_cache")
+    close_connection()
+    database.get_db_path.cache_clear()
+    init_db()
+    yield tmp_path
+    close_connection()
+    database.get_db_path.cache_clear()
+
+
+def add_conversion(data_dir, name, size):
+    """Save a conversion with audio and source files of size bytes each."""
+    paths = []
+    for suffix in (".mp3", ".txt"):
+        path = str(data_dir / f"{name}{suffix}")
+        with open(path, "wb") as f:
+            f.write(b"x" * size)
+        paths.append(path)
+    conversion = Conversion.create("paste", None, paths[1], name, "af_alloy", 1.0,
+                                   paths[0], 1.0, size, size)
+    # Distinct, ordered creation times regardless of clock resolution
+    conversion.created_at_ms = int(name[1:]) * 1000
+    conversion.save()
+    return conversion
+
+
+class TestCleanupIfNeeded:
+    def test_deletes_just_enough_oldest(self, data_dir, monkeypatch):
+        for i in range(10):
+            add_conversion(data_dir, f"c{i}", 100)
+        assert get_storage_usage_bytes() == 2000
+        monkeypatch.setattr(storage, "CLEANUP_BATCH_SIZE", 3)
+        monkeypatch.setattr(Config, "MAX_STORAGE_GB", 1500 / GB)
+
+        assert cleanup_if_needed(300) == 4
+        assert len(Conversion.get_oldest_n(100)) == 6
+        assert not os.path.exists(data_dir / "c3.mp3")
+        assert os.path.exists(data_dir / "c4.mp3")
+        assert get_storage_usage_bytes() == 1200
+
+    def test_evicts_cache_before_history(self, data_dir, monkeypatch):
+        add_conversion(data_dir, "c1", 100)
+        tts_cache.store_cached_audio("k", b"y" * 300)
+        monkeypatch.setattr(Config, "MAX_STORAGE_GB", 300 / GB)
+
+        assert cleanup_if_needed() == 0
+        assert get_storage_usage_bytes() == 200
+
+    def test_concurrent_cleanups_delete_once(self, data_dir, monkeypatch):
+        for i in range(10):
+            add_conversion(data_dir, f"c{i}", 100)
+        monkeypatch.setattr(Config, "MAX_STORAGE_GB", 1500 / GB)
+
+        results = []
+
+        def run():
+            results.append(cleanup_if_needed())
+            close_connection()
+
+        threads = [threading.Thread(target=run) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sum(results) == 3
+        assert get_storage_usage_bytes() == 1400
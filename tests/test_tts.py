@@ -0,0 +1,101 @@
+import contextlib
+import threading
+import pytest
+from app import tts
+from app.config import Config
+from app.tts import TTSError, convert_chunk_parts, convert_text_to_speech
+
+# One MPEG-1 Layer III frame per request, carrying the request text as its
+# payload so the output can be read back in order
+FRAME_HEADER = b'\xff\xfb\x90\x64'
+FRAME_SIZE = 417
+
+TEXT = " ".join(f"Sentence {word} is here." for word in (
+    "alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel",
+    "india", "juliet", "kilo", "lima", "mike", "november", "oscar", "papa",
+))
+
+
+class StubResponse:
+    def __init__(self, data):
+        self.data = data
+
+    def iter_bytes(self, chunk_size=None):
+        yield self.data
+
+
+class StubClient:
+    """Stands in for openai.OpenAI, failing any request fail() is true for."""
+
+    def __init__(self, fail=lambda text: False):
+        self.fail = fail
+        self.requests = []
+        self.lock = threading.Lock()
+        self.audio = self
+        self.speech = self
+        self.with_streaming_response = self
+
+    @contextlib.contextmanager
+    def create(self, model, input, voice, speed):
+        with self.lock:
+            self.requests.append(input)
+        if self.fail(input):
+            raise RuntimeError("backend error")
+        yield StubResponse(FRAME_HEADER + input.encode().ljust(FRAME_SIZE - 4))
+
+
+def read_texts(path):
+    with open(path, 'rb') as f:
+        data = f.read()
+    return [data[pos + 4:pos + FRAME_SIZE].decode().rstrip()
+            for pos in range(0, len(data), FRAME_SIZE)]
+
+
+@pytest.fixture
+def stub(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(Config, "TTS_CACHE_MAX_MB", 0)
+    monkeypatch.setattr(Config, "INITIAL_CHUNK_SIZE", 100)
+    monkeypatch.setattr(tts, "FALLBACK_CHUNK_SIZES", (50,))
+    monkeypatch.setattr(tts, "RETRY_DELAY", 0)
+    client = StubClient()
+    monkeypatch.setattr(tts, "get_tts_client", lambda: client)
+    return client
+
+
+class TestConvertTextToSpeech:
+    def test_writes_chunks_in_order(self, stub, tmp_path):
+        output = tmp_path / "out.mp3"
+        convert_text_to_speech(TEXT, "af_alloy", 1.0, str(output))
+        assert len(stub.requests) > 1
+        assert " ".join(read_texts(output)) == TEXT
+
+    def test_reports_progress(self, stub, tmp_path):
+        calls = []
+        convert_text_to_speech(TEXT, "af_alloy", 1.0, str(tmp_path / "out.mp3"),
+                               lambda current, total: calls.append((current, total)))
+        total = len(calls)
+        assert calls == [(i, total) for i in range(1, total + 1)]
+
+    def test_falls_back_to_sub_chunks(self, stub, tmp_path):
+        stub.fail = lambda text: len(text) > 50
+        output = tmp_path / "out.mp3"
+        convert_text_to_speech(TEXT, "af_alloy", 1.0, str(output))
+        texts = read_texts(output)
+        assert all(len(text) <= 50 for text in texts)
+        assert " ".join(texts) == TEXT
+
+    def test_removes_partial_file_on_failure(self, stub, tmp_path):
+        stub.fail = lambda text: "oscar" in text
+        output = tmp_path / "out.mp3"
+        with pytest.raises(TTSError):
+            convert_text_to_speech(TEXT, "af_alloy", 1.0, str(output))
+        assert not output.exists()
+
+
+class TestConvertChunkParts:
+    def test_makes_no_requests_once_cancelled(self, stub):
+        cancelled = threading.Event()
+        cancelled.set()
+        assert convert_chunk_parts(stub, TEXT, "af_alloy", 1.0, 100, cancelled) == (None, 0)
+        assert stub.requests == []
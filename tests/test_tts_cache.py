@@ -0,0 +1,71 @@
+import os
+import pytest
+from app.config import Config
+from app import tts_cache
+from app.tts_cache import (
+    cache_key, evict_cache, get_cache_size_bytes, get_cached_audio, store_cached_audio
+)
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(Config, "TTS_CACHE_MAX_MB", 1)
+    monkeypatch.setattr(tts_cache, "_cache_bytes", None)
+    os.makedirs(tmp_path / "tts_cache")
+    return tmp_path / "tts_cache"
+
+
+class TestCacheKey:
+    def test_depends_on_every_parameter(self):
+        base = cache_key("Hello", "af_alloy", 1.0, "tts-kokoro")
+        assert base == cache_key("Hello", "af_alloy", 1.0, "tts-kokoro")
+        assert base != cache_key("Hello!", "af_alloy", 1.0, "tts-kokoro")
+        assert base != cache_key("Hello", "af_nova", 1.0, "tts-kokoro")
+        assert base != cache_key("Hello", "af_alloy", 1.5, "tts-kokoro")
+        assert base != cache_key("Hello", "af_alloy", 1.0, "tts-1")
+
+
+class TestCachedAudio:
+    def test_round_trip(self, cache_dir):
+        assert get_cached_audio("a") is None
+        store_cached_audio("a", b"audio")
+        assert get_cached_audio("a") == b"audio"
+
+    def test_disabled(self, cache_dir, monkeypatch):
+        monkeypatch.setattr(Config, "TTS_CACHE_MAX_MB", 0)
+        store_cached_audio("a", b"audio")
+        assert get_cached_audio("a") is None
+        assert os.listdir(cache_dir) == []
+
+    def test_ignores_eviction_errors(self, cache_dir, monkeypatch):
+        def fail(target_bytes):
+            raise FileNotFoundError
+        monkeypatch.setattr(tts_cache, "_evict", fail)
+        store_cached_audio("big", b"x" * (2 * 1024 * 1024))
+        assert get_cached_audio("big") is not None
+
+    def test_evicts_least_recently_used(self, cache_dir):
+        half = b"x" * (512 * 1024)
+        store_cached_audio("old", half)
+        store_cached_audio("new", half)
+        os.utime(cache_dir / "old.mp3", (1, 1))
+        os.utime(cache_dir / "new.mp3", (2, 2))
+
+        store_cached_audio("newest", b"y")
+
+        assert get_cached_audio("old") is None
+        assert get_cached_audio("new") == half
+        assert get_cached_audio("newest") == b"y"
+
+    def test_evict_frees_least_recently_used(self, cache_dir):
+        store_cached_audio("old", b"x" * 100)
+        store_cached_audio("new", b"y" * 100)
+        os.utime(cache_dir / "old.mp3", (1, 1))
+        os.utime(cache_dir / "new.mp3", (2, 2))
+        assert get_cache_size_bytes() == 200
+
+        assert evict_cache(50) == 100
+        assert get_cached_audio("old") is None
+        assert get_cached_audio("new") == b"y" * 100
+        assert get_cache_size_bytes() == 100